@@ -2,37 +2,127 @@ import os
 import json
 import hashlib
 import time
+import asyncio
+import functools
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple
-import requests
+import httpx
+import numpy as np
 from PIL import Image
-import base64
 from io import BytesIO
 from config import *
+from colors import parse_hex
+
+try:
+    import orjson
+except ImportError:  # Fall back to stdlib json
+    orjson = None
+
+@functools.lru_cache(maxsize=256)
+def _fallback_path(rgb: Tuple[int, int, int], size: int) -> str:
+    """Create (once per color and size) a colored rectangle sprite and return its path"""
+    asset_path = os.path.join(ASSET_CACHE_DIR, "fallback_%02x%02x%02x_%d.png" % (*rgb, size))
+    
+    if not os.path.exists(asset_path):
+        # Create image with a simple white border
+        pixels = np.full((size, size, 4), (*rgb, 255), dtype=np.uint8)
+        pixels[[0, -1], :, :3] = 255
+        pixels[:, [0, -1], :3] = 255
+        image = Image.fromarray(pixels, 'RGBA')
+        
+        image.save(asset_path, "PNG", compress_level=1, optimize=False)
+        print(f"🎨 Created fallback asset: {os.path.basename(asset_path)}")
+    
+    return asset_path
+
+# Shared worker pool for image decode/resize/save so PIL work stays off the event loop
+_image_executor = ThreadPoolExecutor(max_workers=MAX_DALLE_REQUESTS_PER_GAME)
+
+# DALL-E prompt templates keyed by (asset kind, game type); None is the default for a kind
+_SPRITE_PROMPT = "%(art_style)s art style, %(theme)s theme, mobile game sprite"
+_BACKGROUND_PROMPT = "%(art_style)s art style, %(theme)s theme, mobile game background"
+
+PROMPT_TEMPLATES = {
+    ('player', 'racing'): _SPRITE_PROMPT + ", top-down racing car, sleek design, bright colors, Formula 1 style, detailed wheels, transparent background, 32x32 pixels",
+    ('player', 'flappy'): _SPRITE_PROMPT + ", cute flying bird character, colorful feathers, expressive eyes, wings spread, cartoon style, transparent background, 32x32 pixels",
+    ('player', 'shooter'): _SPRITE_PROMPT + ", futuristic spaceship, detailed hull, engine thrusters, sci-fi design, metallic finish, transparent background, 32x32 pixels",
+    ('player', None): _SPRITE_PROMPT + ", heroic character, detailed armor, determined expression, action pose, RPG quality, transparent background, 32x32 pixels",
+    ('background', 'racing'): _BACKGROUND_PROMPT + ", professional racing track, asphalt surface, white lane markings, grandstands, aerial view, detailed track, 800x600 resolution",
+    ('background', 'flappy'): _BACKGROUND_PROMPT + ", beautiful sky environment, fluffy clouds, gradient blue sky, distant mountains, parallax layers, bright atmosphere, 800x600 resolution",
+    ('background', 'shooter'): _BACKGROUND_PROMPT + ", deep space environment, star field, nebulae, cosmic dust, sci-fi atmosphere, 800x600 resolution",
+    ('background', None): _BACKGROUND_PROMPT + ", detailed platformer environment, lush forest, rocky platforms, atmospheric lighting, adventure game quality, 800x600 resolution",
+    ('enemy', None): "%(art_style)s art style, %(theme)s theme, enemy creature, menacing appearance, detailed features, hostile design, video game quality, transparent background, 32x32 pixels",
+    ('collectible', None): "%(art_style)s art style, %(theme)s theme, collectible item, shiny treasure, magical glow, valuable object, game pickup, transparent background, 24x24 pixels",
+    ('platform', None): "%(art_style)s art style, %(theme)s theme, platform texture, tileable surface, detailed texture, game environment, seamless tile, 64x32 pixels",
+}
+
+def _decode_resize_save(image_data: bytes, size: Tuple[int, int], asset_path: str):
+    """Decode an image, resize it to the target size and save it as PNG"""
+    image = Image.open(BytesIO(image_data))
+    if image.size != tuple(size):
+        image = image.resize(size, Image.Resampling.LANCZOS)
+    image.save(asset_path, "PNG", compress_level=1, optimize=False)
+
+# Assets up to this size are requested from DALL-E at 256x256
+SMALL_SPRITE_MAX_SIZE = 64
+
+# Square sprites generated together are laid out on a SPRITESHEET_GRID x SPRITESHEET_GRID canvas
+SPRITESHEET_GRID = 2
+SPRITESHEET_SIZE = (1024, 1024)
+SPRITESHEET_POSITIONS = ('top-left', 'top-right', 'bottom-left', 'bottom-right')
+
+def _split_spritesheet(image_data: bytes, sizes: List[Tuple[int, int]], asset_paths: List[str]):
+    """Crop each grid tile out of a sprite sheet, resize it and save it as PNG"""
+    sheet = Image.open(BytesIO(image_data))
+    tile_w = sheet.width // SPRITESHEET_GRID
+    tile_h = sheet.height // SPRITESHEET_GRID
+    for i, (size, asset_path) in enumerate(zip(sizes, asset_paths)):
+        x = (i % SPRITESHEET_GRID) * tile_w
+        y = (i // SPRITESHEET_GRID) * tile_h
+        tile = sheet.crop((x, y, x + tile_w, y + tile_h)).resize(size, Image.Resampling.LANCZOS)
+        tile.save(asset_path, "PNG", compress_level=1, optimize=False)
 
 class AssetManager:
     def __init__(self):
         self.asset_cache: Dict[str, str] = {}
         self.dalle_request_count = 0
         self.cache_dir = ASSET_CACHE_DIR
+        self._client: Optional[httpx.AsyncClient] = None
         os.makedirs(self.cache_dir, exist_ok=True)
         self.load_cache()
+        # Cache keys with a PNG on disk, scanned once so lookups skip stat() calls
+        self._on_disk = {name[:-4] for name in os.listdir(self.cache_dir) if name.endswith('.png')}
     
     def load_cache(self):
         """Load cached assets from disk"""
         cache_file = os.path.join(self.cache_dir, "asset_cache.json")
         if os.path.exists(cache_file):
-            with open(cache_file, 'r') as f:
-                self.asset_cache = json.load(f)
+            with open(cache_file, 'rb') as f:
+                data = f.read()
+            self.asset_cache = orjson.loads(data) if orjson else json.loads(data)
     
     def save_cache(self):
         """Save asset cache to disk"""
         cache_file = os.path.join(self.cache_dir, "asset_cache.json")
-        with open(cache_file, 'w') as f:
-            json.dump(self.asset_cache, f)
+        tmp_file = f"{cache_file}.tmp"
+        data = orjson.dumps(self.asset_cache) if orjson else json.dumps(self.asset_cache).encode()
+        with open(tmp_file, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_file, cache_file)
     
-    def get_cache_key(self, prompt: str, asset_type: str) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def get_cache_key(prompt: str, asset_type: str) -> str:
         """Generate unique cache key for asset"""
         content = f"{prompt}_{asset_type}_{SPRITE_SIZE}"
+        return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def get_legacy_cache_key(prompt: str, asset_type: str) -> str:
+        """Generate the MD5 cache key used by older caches"""
+        content = f"{prompt}_{asset_type}_{SPRITE_SIZE}"
         return hashlib.md5(content.encode()).hexdigest()
     
     async def generate_game_assets(self, game_data: dict) -> Dict[str, str]:
@@ -50,16 +140,60 @@ class AssetManager:
         
         print(f"Priority assets identified: {len(priority_requests)}")
         
-        # Step 2: Generate priority assets with DALL-E (max 5)
+        # Step 2: Generate priority assets with DALL-E (max 5, concurrently)
+        if len(priority_requests) > MAX_DALLE_REQUESTS_PER_GAME:
+            print(f"DALL-E limit reached ({MAX_DALLE_REQUESTS_PER_GAME}), using fallbacks")
+        priority_requests = priority_requests[:MAX_DALLE_REQUESTS_PER_GAME]
+        
+        # Coalesce entries that resolve to the same cache key into a single request
+        unique_requests: Dict[str, Dict] = {}
+        aliases: Dict[str, List[str]] = defaultdict(list)
         for asset_info in priority_requests:
-            if self.dalle_request_count >= MAX_DALLE_REQUESTS_PER_GAME:
-                print(f"DALL-E limit reached ({MAX_DALLE_REQUESTS_PER_GAME}), using fallbacks")
-                break
-            
-            asset_path = await self._generate_dalle_asset(asset_info)
-            if asset_path:
-                assets[asset_info['name']] = asset_path
-                self.dalle_request_count += 1
+            cache_key = self.get_cache_key(asset_info['prompt'], asset_info['type'])
+            unique_requests.setdefault(cache_key, asset_info)
+            aliases[cache_key].append(asset_info['name'])
+        
+        # Uncached square sprites share a single sprite sheet request; the rest go one by one
+        sheet_keys = [
+            cache_key for cache_key, asset_info in unique_requests.items()
+            if asset_info['type'] != 'background'
+            and asset_info['size'][0] == asset_info['size'][1]
+            and not self._find_cached_asset(asset_info)
+        ][:len(SPRITESHEET_POSITIONS)]
+        if len(sheet_keys) < 2:
+            sheet_keys = []
+        single_keys = [cache_key for cache_key in unique_requests if cache_key not in sheet_keys]
+        
+        semaphore = asyncio.Semaphore(MAX_DALLE_REQUESTS_PER_GAME)
+        tasks = [self._generate_dalle_asset(unique_requests[cache_key], semaphore) for cache_key in single_keys]
+        if sheet_keys:
+            tasks.append(self._generate_dalle_spritesheet([unique_requests[key] for key in sheet_keys], semaphore))
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        generated = dict(zip(single_keys, results))
+        if sheet_keys:
+            sheet_paths = results[-1]
+            if isinstance(sheet_paths, BaseException):
+                generated.update((key, sheet_paths) for key in sheet_keys)
+            else:
+                generated.update(zip(sheet_keys, sheet_paths))
+        
+        for cache_key, asset_path in generated.items():
+            asset_info = unique_requests[cache_key]
+            if isinstance(asset_path, BaseException):
+                print(f"❌ Error generating {asset_info['name']}: {str(asset_path)}")
+            elif asset_path:
+                for name in aliases[cache_key]:
+                    assets[name] = asset_path
+                if cache_key not in sheet_keys:
+                    self.dalle_request_count += 1
+        
+        # The whole sprite sheet costs a single DALL-E request
+        if any(isinstance(generated[key], str) for key in sheet_keys):
+            self.dalle_request_count += 1
+        
+        # Flush the cache index once for the whole batch
+        self.save_cache()
         
         # Step 3: Generate fallback assets for remaining entities
         remaining_entities = self._get_remaining_entities(game_data, assets)
@@ -73,176 +207,214 @@ class AssetManager:
     def _identify_priority_assets(self, game_data: dict) -> List[Dict]:
         """Identify the most important assets for DALL-E generation"""
         priority_requests = []
+        theme = game_data.get('theme', 'fantasy')
+        art_style = game_data.get('artStyle', 'pixel')
+        game_type = game_data.get('gameType', 'platformer')
+        levels = game_data.get('levels', [])
         
-        # 1. Player character (highest priority)
+        # Single pass over entities and levels to find what each priority slot needs
         player_entity = None
+        enemy_entity = None
         for entity in game_data.get('entities', []):
-            if entity.get('type') == 'player':
+            if player_entity is None and entity.get('type') == 'player':
                 player_entity = entity
+            if enemy_entity is None and 'enemy' in entity.get('name', '').lower():
+                enemy_entity = entity
+            if player_entity and enemy_entity:
                 break
         
+        has_collectibles = False
+        has_platforms = False
+        for level in levels:
+            has_collectibles = has_collectibles or bool(level.get('collectibles'))
+            has_platforms = has_platforms or bool(level.get('platforms'))
+            if has_collectibles and has_platforms:
+                break
+        
+        # 1. Player character (highest priority)
         if player_entity:
             priority_requests.append({
                 'name': player_entity['name'],
                 'type': 'character',
-                'prompt': self._create_player_prompt(player_entity, game_data),
+                'prompt': self._build_prompt('player', game_type, theme, art_style),
                 'size': (SPRITE_SIZE, SPRITE_SIZE)
             })
         
         # 2. Background (second priority)
-        if game_data.get('levels') and len(game_data['levels']) > 0:
-            level = game_data['levels'][0]
+        if levels:
             priority_requests.append({
                 'name': 'background',
                 'type': 'background',
-                'prompt': self._create_background_prompt(level, game_data),
+                'prompt': self._build_prompt('background', game_type, theme, art_style),
                 'size': BACKGROUND_SIZE
             })
         
         # 3. Primary enemy (third priority)
-        enemies = [e for e in game_data.get('entities', []) if 'enemy' in e.get('name', '').lower()]
-        if enemies:
-            enemy = enemies[0]  # Take first enemy
+        if enemy_entity:
             priority_requests.append({
-                'name': enemy['name'],
+                'name': enemy_entity['name'],
                 'type': 'character', 
-                'prompt': self._create_enemy_prompt(enemy, game_data),
+                'prompt': self._build_prompt('enemy', game_type, theme, art_style),
                 'size': (SPRITE_SIZE, SPRITE_SIZE)
             })
         
         # 4. Collectible (fourth priority)
-        collectibles = []
-        for level in game_data.get('levels', []):
-            collectibles.extend(level.get('collectibles', []))
-        
-        if collectibles:
+        if has_collectibles:
             priority_requests.append({
                 'name': 'collectible',
                 'type': 'item',
-                'prompt': self._create_collectible_prompt(collectibles[0], game_data),
+                'prompt': self._build_prompt('collectible', game_type, theme, art_style),
                 'size': (24, 24)
             })
         
         # 5. Platform texture (fifth priority)
-        platforms = []
-        for level in game_data.get('levels', []):
-            platforms.extend(level.get('platforms', []))
-        
-        if platforms:
+        if has_platforms:
             priority_requests.append({
                 'name': 'platform',
                 'type': 'tile',
-                'prompt': self._create_platform_prompt(platforms[0], game_data),
+                'prompt': self._build_prompt('platform', game_type, theme, art_style),
                 'size': (64, 32)
             })
         
         return priority_requests[:MAX_DALLE_REQUESTS_PER_GAME]
     
-    def _create_player_prompt(self, entity: dict, game_data: dict) -> str:
-        theme = game_data.get('theme', 'fantasy')
-        art_style = game_data.get('artStyle', 'pixel')
-        game_type = game_data.get('gameType', 'platformer')
-        
-        base_prompt = f"{art_style} art style, {theme} theme, mobile game sprite"
-        
-        if game_type == 'racing':
-            return f"{base_prompt}, top-down racing car, sleek design, bright colors, Formula 1 style, detailed wheels, transparent background, 32x32 pixels"
-        elif game_type == 'flappy':
-            return f"{base_prompt}, cute flying bird character, colorful feathers, expressive eyes, wings spread, cartoon style, transparent background, 32x32 pixels" 
-        elif game_type == 'shooter':
-            return f"{base_prompt}, futuristic spaceship, detailed hull, engine thrusters, sci-fi design, metallic finish, transparent background, 32x32 pixels"
-        else:
-            return f"{base_prompt}, heroic character, detailed armor, determined expression, action pose, RPG quality, transparent background, 32x32 pixels"
+    def _build_prompt(self, kind: str, game_type: str, theme: str, art_style: str) -> str:
+        """Build the DALL-E prompt for an asset kind from the template table"""
+        template = PROMPT_TEMPLATES.get((kind, game_type)) or PROMPT_TEMPLATES[(kind, None)]
+        return template % {'theme': theme, 'art_style': art_style}
     
-    def _create_background_prompt(self, level: dict, game_data: dict) -> str:
-        theme = game_data.get('theme', 'fantasy')
-        art_style = game_data.get('artStyle', 'pixel')
-        game_type = game_data.get('gameType', 'platformer')
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared async HTTP client, creating it on first use"""
+        if self._client is None:
+            # One pooled HTTP/2 connection multiplexes concurrent DALL-E requests
+            transport = httpx.AsyncHTTPTransport(
+                http2=True,
+                retries=2,
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=10)
+            )
+            self._client = httpx.AsyncClient(transport=transport, timeout=60)
+        return self._client
+    
+    async def aclose(self):
+        """Close the shared HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    def _get_dalle_model_params(self, size: Tuple[int, int]) -> Dict[str, str]:
+        """Pick the smallest DALL-E model/size that still covers the target size"""
+        if max(size) <= SMALL_SPRITE_MAX_SIZE:
+            # Small sprites: DALL-E 2 supports 256x256, ~16x less data than 1024x1024
+            return {"model": "dall-e-2", "size": "256x256"}
+        return {"model": "dall-e-3", "size": "1024x1024", "quality": "standard"}
+    
+    def _find_cached_asset(self, asset_info: Dict) -> Optional[str]:
+        """Return the cached file for an asset, also checking keys from older MD5-keyed caches"""
+        for key in (self.get_cache_key(asset_info['prompt'], asset_info['type']),
+                    self.get_legacy_cache_key(asset_info['prompt'], asset_info['type'])):
+            if key in self.asset_cache and key in self._on_disk:
+                return os.path.join(self.cache_dir, f"{key}.png")
+        return None
+    
+    async def _request_dalle_image(self, prompt: str, size: Tuple[int, int]) -> Optional[bytes]:
+        """Request one image from DALL-E and download its bytes, or None if the request fails"""
+        response = await self._get_client().post(
+            "https://api.openai.com/v1/images/generations",
+            headers={
+                "Authorization": f"Bearer {OPENAI_API_KEY}",
+                "Content-Type": "application/json"
+            },
+            json={
+                **self._get_dalle_model_params(size),
+                "prompt": prompt,
+                "n": 1,
+                "response_format": "url"
+            }
+        )
         
-        base_prompt = f"{art_style} art style, {theme} theme, mobile game background"
+        if response.status_code != 200:
+            print(f"❌ DALL-E request failed: {response.status_code}")
+            return None
         
-        if game_type == 'racing':
-            return f"{base_prompt}, professional racing track, asphalt surface, white lane markings, grandstands, aerial view, detailed track, 800x600 resolution"
-        elif game_type == 'flappy':
-            return f"{base_prompt}, beautiful sky environment, fluffy clouds, gradient blue sky, distant mountains, parallax layers, bright atmosphere, 800x600 resolution"
-        elif game_type == 'shooter':
-            return f"{base_prompt}, deep space environment, star field, nebulae, cosmic dust, sci-fi atmosphere, 800x600 resolution"
-        else:
-            return f"{base_prompt}, detailed platformer environment, lush forest, rocky platforms, atmospheric lighting, adventure game quality, 800x600 resolution"
-    
-    def _create_enemy_prompt(self, entity: dict, game_data: dict) -> str:
-        theme = game_data.get('theme', 'fantasy')
-        art_style = game_data.get('artStyle', 'pixel')
+        image_url = response.json()['data'][0]['url']
         
-        return f"{art_style} art style, {theme} theme, enemy creature, menacing appearance, detailed features, hostile design, video game quality, transparent background, 32x32 pixels"
+        # Download the raw image bytes (avoids the base64 round-trip)
+        async with self._get_client().stream('GET', image_url) as image_response:
+            image_response.raise_for_status()
+            return await image_response.aread()
     
-    def _create_collectible_prompt(self, collectible: dict, game_data: dict) -> str:
-        theme = game_data.get('theme', 'fantasy')
-        art_style = game_data.get('artStyle', 'pixel')
+    async def _generate_dalle_spritesheet(self, entries: List[Dict], semaphore: asyncio.Semaphore) -> List[Optional[str]]:
+        """Generate several square sprites with a single DALL-E request laid out as a grid"""
+        names = ", ".join(asset_info['name'] for asset_info in entries)
+        tiles = ", ".join(
+            f"{position}: {asset_info['prompt']}"
+            for position, asset_info in zip(SPRITESHEET_POSITIONS, entries)
+        )
+        prompt = (
+            f"{SPRITESHEET_GRID}x{SPRITESHEET_GRID} grid sprite sheet, {tiles}, "
+            f"transparent background between tiles, "
+            f"{SPRITESHEET_SIZE[0] // SPRITESHEET_GRID}x{SPRITESHEET_SIZE[1] // SPRITESHEET_GRID} pixels per tile"
+        )
         
-        return f"{art_style} art style, {theme} theme, collectible item, shiny treasure, magical glow, valuable object, game pickup, transparent background, 24x24 pixels"
+        try:
+            async with semaphore:
+                print(f"🎨 Generating DALL-E sprite sheet: {names}")
+                image_data = await self._request_dalle_image(prompt, SPRITESHEET_SIZE)
+            
+            if image_data is None:
+                return [None] * len(entries)
+            
+            cache_keys = [self.get_cache_key(asset_info['prompt'], asset_info['type']) for asset_info in entries]
+            asset_paths = [os.path.join(self.cache_dir, f"{cache_key}.png") for cache_key in cache_keys]
+            
+            # Split, resize and save the tiles in a worker thread
+            await asyncio.get_running_loop().run_in_executor(
+                _image_executor, _split_spritesheet, image_data,
+                [asset_info['size'] for asset_info in entries], asset_paths
+            )
+            
+            # Update cache (flushed to disk by generate_game_assets)
+            for cache_key, asset_path in zip(cache_keys, asset_paths):
+                self.asset_cache[cache_key] = asset_path
+                self._on_disk.add(cache_key)
+            
+            print(f"✅ Generated sprite sheet: {names}")
+            return asset_paths
+            
+        except Exception as e:
+            print(f"❌ Error generating sprite sheet {names}: {str(e)}")
+            return [None] * len(entries)
     
-    def _create_platform_prompt(self, platform: dict, game_data: dict) -> str:
-        theme = game_data.get('theme', 'fantasy')
-        art_style = game_data.get('artStyle', 'pixel')
+    async def _generate_dalle_asset(self, asset_info: Dict, semaphore: asyncio.Semaphore) -> Optional[str]:
+        """Generate single asset using DALL-E"""
+        cached_path = self._find_cached_asset(asset_info)
+        if cached_path:
+            print(f"📦 Using cached asset: {asset_info['name']}")
+            return cached_path
         
-        return f"{art_style} art style, {theme} theme, platform texture, tileable surface, detailed texture, game environment, seamless tile, 64x32 pixels"
-    
-    async def _generate_dalle_asset(self, asset_info: Dict) -> Optional[str]:
-        """Generate single asset using DALL-E 3"""
         cache_key = self.get_cache_key(asset_info['prompt'], asset_info['type'])
         
-        # Check cache first
-        if cache_key in self.asset_cache:
-            cached_path = os.path.join(self.cache_dir, f"{cache_key}.png")
-            if os.path.exists(cached_path):
-                print(f"📦 Using cached asset: {asset_info['name']}")
-                return cached_path
-        
         try:
-            print(f"🎨 Generating DALL-E asset: {asset_info['name']}")
+            async with semaphore:
+                print(f"🎨 Generating DALL-E asset: {asset_info['name']}")
+                image_data = await self._request_dalle_image(asset_info['prompt'], asset_info['size'])
+            
+            if image_data is None:
+                print(f"❌ DALL-E request failed for {asset_info['name']}")
+                return None
             
-            response = requests.post(
-                "https://api.openai.com/v1/images/generations",
-                headers={
-                    "Authorization": f"Bearer {OPENAI_API_KEY}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "dall-e-3",
-                    "prompt": asset_info['prompt'],
-                    "n": 1,
-                    "size": "1024x1024",
-                    "quality": "standard",
-                    "response_format": "b64_json"
-                },
-                timeout=60
+            # Decode, resize and save to cache in a worker thread
+            asset_path = os.path.join(self.cache_dir, f"{cache_key}.png")
+            await asyncio.get_running_loop().run_in_executor(
+                _image_executor, _decode_resize_save, image_data, asset_info['size'], asset_path
             )
             
-            if response.status_code == 200:
-                data = response.json()
-                b64_image = data['data'][0]['b64_json']
-                
-                # Decode and resize image
-                image_data = base64.b64decode(b64_image)
-                image = Image.open(BytesIO(image_data))
-                
-                # Resize to target size
-                image = image.resize(asset_info['size'], Image.Resampling.LANCZOS)
-                
-                # Save to cache
-                asset_path = os.path.join(self.cache_dir, f"{cache_key}.png")
-                image.save(asset_path, "PNG")
-                
-                # Update cache
-                self.asset_cache[cache_key] = asset_path
-                self.save_cache()
-                
-                print(f"✅ Generated: {asset_info['name']}")
-                return asset_path
-            else:
-                print(f"❌ DALL-E request failed for {asset_info['name']}: {response.status_code}")
-                return None
+            # Update cache (flushed to disk by generate_game_assets)
+            self.asset_cache[cache_key] = asset_path
+            self._on_disk.add(cache_key)
+            
+            print(f"✅ Generated: {asset_info['name']}")
+            return asset_path
                 
         except Exception as e:
             print(f"❌ Error generating {asset_info['name']}: {str(e)}")
@@ -260,31 +432,27 @@ class AssetManager:
     
     def _create_fallback_asset(self, entity: dict) -> str:
         """Create simple colored rectangle fallback for entity"""
-        cache_key = f"fallback_{entity['name']}_{entity.get('color', '#4A90E2')}"
-        asset_path = os.path.join(self.cache_dir, f"{cache_key}.png")
-        
-        if not os.path.exists(asset_path):
-            # Create simple colored rectangle
-            color = entity.get('color', '#4A90E2')
-            # Convert hex to RGB
-            if color.startswith('#'):
-                color = color[1:]
-                rgb = tuple(int(color[i:i+2], 16) for i in (0, 2, 4))
-            else:
-                rgb = (74, 144, 226)  # Default blue
-            
-            # Create image
-            image = Image.new('RGBA', (SPRITE_SIZE, SPRITE_SIZE), (*rgb, 255))
-            
-            # Add simple border
-            from PIL import ImageDraw
-            draw = ImageDraw.Draw(image)
-            draw.rectangle([0, 0, SPRITE_SIZE-1, SPRITE_SIZE-1], outline=(255, 255, 255, 255), width=1)
-            
-            image.save(asset_path, "PNG")
-            print(f"🎨 Created fallback asset: {entity['name']}")
+        rgb = parse_hex(entity.get('color', '#4A90E2')) or (74, 144, 226)  # Default blue
         
-        return asset_path
+        return _fallback_path(rgb, SPRITE_SIZE)
+    
+    def clear_memory_cache(self):
+        """Forget all in-memory cache state so it is rebuilt from disk"""
+        self.asset_cache.clear()
+        self._on_disk.clear()
+        _fallback_path.cache_clear()
+
+# Global instance, created on first use so importing this module stays cheap
+_asset_manager: Optional[AssetManager] = None
+
+def get_asset_manager() -> AssetManager:
+    """Get the shared AssetManager, creating it on first use"""
+    global _asset_manager
+    if _asset_manager is None:
+        _asset_manager = AssetManager()
+    return _asset_manager
 
-# Global instance
-asset_manager = AssetManager()
\ No newline at end of file
+async def close_asset_manager():
+    """Close the shared AssetManager's connections if it was ever created"""
+    if _asset_manager is not None:
+        await _asset_manager.aclose()
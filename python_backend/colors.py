@@ -0,0 +1,25 @@
+from typing import Dict, Optional, Tuple
+
+# Parsed color strings; games reuse a small palette so this stays tiny
+_HEX_CACHE: Dict[str, Tuple[int, int, int]] = {}
+
+def parse_hex(color_str: str) -> Optional[Tuple[int, int, int]]:
+    """Parse a '#RRGGBB', '#RRGGBBAA' (alpha ignored) or '#RGB' color string to an RGB tuple, or None if it isn't one"""
+    color = _HEX_CACHE.get(color_str)
+    if color is None:
+        if not color_str.startswith('#'):
+            return None
+        digits = color_str[1:]
+        if len(digits) == 3:
+            digits = ''.join(c * 2 for c in digits)
+        elif len(digits) in (6, 8):
+            digits = digits[:6]
+        else:
+            return None
+        try:
+            value = int(digits, 16)
+        except ValueError:
+            return None
+        color = (value >> 16 & 0xFF, value >> 8 & 0xFF, value & 0xFF)
+        _HEX_CACHE[color_str] = color
+    return color
@@ -1,12 +1,29 @@
 import pygame
 import pymunk
+import numpy as np
 import math
 import json
 import asyncio
-from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass
-from enum import Enum
+from typing import Callable, Dict, List, Set, Tuple, Optional
+from enum import Enum, IntFlag
 from config import *
+from colors import parse_hex
+from quadtree import Quadtree, AABB
+from physics_kernels import step_enemies, step_camera, warmup as warmup_kernels
+
+# Objects within this many pixels of the screen edge are still updated and drawn
+VIEW_MARGIN = 64
+# Cell size of the fixed grid used to look up static objects near the camera
+GRID_CELL_SIZE = 256
+# Pymunk collision types for ground contact tracking
+PLAYER_COLLISION_TYPE = 1
+PLATFORM_COLLISION_TYPE = 2
+# A platform contact counts as ground when its normal (player -> platform, y down) is at least this vertical
+GROUND_NORMAL_MIN_Y = 0.5
+# Redraw the whole frame once the dirty area exceeds this fraction of the screen
+DIRTY_AREA_LIMIT = 0.35
+# Filtered (slower) scaling when resizing sprites to entity size
+SMOOTH_SCALE_SPRITES = False
 
 class GameType(Enum):
     PLATFORMER = "platformer"
@@ -15,105 +32,228 @@ class GameType(Enum):
     SHOOTER = "shooter"
     TETRIS = "tetris"
 
-@dataclass
+class InputBits(IntFlag):
+    """Logical input actions, packed into one int per frame"""
+    LEFT = 1
+    RIGHT = 2
+    UP = 4
+    DOWN = 8
+    JUMP = 16
+    
+    @classmethod
+    def from_names(cls, names) -> int:
+        """Translate key names ('left', 'a', 'space', ...) into a bitmask"""
+        bits = 0
+        for name in names:
+            bits |= _KEY_BITS.get(name, 0)
+        return bits
+
+# Arrow and WASD bindings collapse onto the same action bit
+_KEY_BITS: Dict[str, int] = {
+    'left': InputBits.LEFT, 'a': InputBits.LEFT,
+    'right': InputBits.RIGHT, 'd': InputBits.RIGHT,
+    'up': InputBits.UP, 'w': InputBits.UP,
+    'down': InputBits.DOWN, 's': InputBits.DOWN,
+    'space': InputBits.JUMP,
+}
+
 class GameState:
-    score: int = 0
-    health: int = 100
-    time: float = 0.0
-    level: int = 0
-    lives: int = 3
-    game_over: bool = False
-    win: bool = False
+    __slots__ = ('score', 'health', 'time', 'level', 'lives', 'game_over', 'win')
+    
+    def __init__(self, score: int = 0, health: int = 100, time: float = 0.0, level: int = 0,
+                 lives: int = 3, game_over: bool = False, win: bool = False):
+        self.score = score
+        self.health = health
+        self.time = time
+        self.level = level
+        self.lives = lives
+        self.game_over = game_over
+        self.win = win
 
-class GameObject:
+class ArrayField:
+    """Object attribute kept in the engine's EntityArrays once the object is bound to them"""
+    def __init__(self, array_name: str, cast=float):
+        self.array_name = array_name
+        self.cast = cast
+    
+    def __set_name__(self, owner, name: str):
+        self.private_name = '_' + name
+    
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        arrays = obj._arrays
+        if arrays is None:
+            return getattr(obj, self.private_name)
+        return self.cast(getattr(arrays, self.array_name)[obj.idx])
+    
+    def __set__(self, obj, value):
+        arrays = obj._arrays
+        if arrays is None:
+            setattr(obj, self.private_name, value)
+        else:
+            getattr(arrays, self.array_name)[obj.idx] = value
+
+class GameObject(pygame.sprite.Sprite):
+    # ArrayField values live in the '_'-prefixed slots until the object is bound to EntityArrays
+    __slots__ = ('_arrays', 'idx', 'name', '_x', '_y', 'width', 'height', '_velocity_x', '_velocity_y',
+                 'color', 'sprite_path', 'sprite', '_active', 'image', 'rect')
+    
+    x = ArrayField('pos_x')
+    y = ArrayField('pos_y')
+    velocity_x = ArrayField('vel_x')
+    velocity_y = ArrayField('vel_y')
+    active = ArrayField('active', bool)
+    
     def __init__(self, name: str, x: float, y: float, width: float, height: float):
-        self.name = name
+        pygame.sprite.Sprite.__init__(self)
+        self._arrays: Optional['EntityArrays'] = None
+        self.idx: int = -1
+        self.name: str = name
         self.x = x
         self.y = y
-        self.width = width
-        self.height = height
+        self.width: float = width
+        self.height: float = height
         self.velocity_x = 0.0
         self.velocity_y = 0.0
-        self.color = (255, 255, 255)
+        self.color: Tuple[int, int, int] = (255, 255, 255)
         self.sprite_path: Optional[str] = None
         self.sprite: Optional[pygame.Surface] = None
         self.active = True
         
-    def update(self, dt: float):
-        """Update object physics and state"""
-        self.x += self.velocity_x * dt
-        self.y += self.velocity_y * dt
+        # Sprite group drawing state (rect holds the on-screen position)
+        self.image: Optional[pygame.Surface] = None
+        self.rect = pygame.Rect(int(x), int(y), int(width), int(height))
     
-    def render(self, screen: pygame.Surface, camera_offset: Tuple[float, float] = (0, 0)):
-        """Render object to screen"""
-        render_x = self.x - camera_offset[0]
-        render_y = self.y - camera_offset[1]
-        
+    def build_image(self):
+        """Set the image drawn by sprite groups: the sprite, or a solid-color surface"""
         if self.sprite:
-            screen.blit(self.sprite, (render_x, render_y))
+            self.image = self.sprite
         else:
-            pygame.draw.rect(screen, self.color, 
-                           (render_x, render_y, self.width, self.height))
+            self.image = pygame.Surface((int(self.width), int(self.height)))
+            self.image.fill(self.color)
 
 class Player(GameObject):
+    __slots__ = ('ground_shapes', 'jump_force', 'move_speed', 'health', 'can_jump',
+                 'physics_body', 'physics_shape')
+    _layer = 3
+    
     def __init__(self, name: str, x: float, y: float, width: float, height: float):
         super().__init__(name, x, y, width, height)
-        self.on_ground = False
-        self.jump_force = JUMP_FORCE
-        self.move_speed = MOVE_SPEED
-        self.health = 100
-        self.can_jump = True
+        # Platform shapes the player is currently standing on (kept by Pymunk collision callbacks)
+        self.ground_shapes: Set[pymunk.Shape] = set()
+        self.jump_force: float = JUMP_FORCE
+        self.move_speed: float = MOVE_SPEED
+        self.health: int = 100
+        self.can_jump: bool = True
+    
+    @property
+    def on_ground(self) -> bool:
+        return bool(self.ground_shapes)
         
-    def jump(self):
+    def jump(self) -> None:
         if self.on_ground and self.can_jump:
             self.velocity_y = self.jump_force
-            self.on_ground = False
     
-    def move_left(self, dt: float):
+    def move_left(self, dt: float) -> None:
         self.velocity_x = -self.move_speed
     
-    def move_right(self, dt: float):
+    def move_right(self, dt: float) -> None:
         self.velocity_x = self.move_speed
     
-    def stop_horizontal(self):
+    def stop_horizontal(self) -> None:
         self.velocity_x = 0
 
 class Enemy(GameObject):
+    __slots__ = ('_speed', '_direction', '_patrol_range', '_start_x', 'physics_body', 'physics_shape')
+    _layer = 2
+    speed = ArrayField('speed')
+    direction = ArrayField('direction', int)
+    patrol_range = ArrayField('patrol_range')
+    start_x = ArrayField('start_x')
+    
     def __init__(self, name: str, x: float, y: float, width: float, height: float):
         super().__init__(name, x, y, width, height)
         self.speed = 50
         self.direction = 1
         self.patrol_range = 100
         self.start_x = x
-        
-    def update(self, dt: float):
-        # Simple patrol AI
-        if self.x >= self.start_x + self.patrol_range:
-            self.direction = -1
-        elif self.x <= self.start_x:
-            self.direction = 1
-            
-        self.velocity_x = self.speed * self.direction
-        super().update(dt)
 
 class Collectible(GameObject):
-    def __init__(self, name: str, x: float, y: float, width: float, height: float, points: int = 10):
+    __slots__ = ('points', 'collected', 'on_collect')
+    _layer = 1
+    
+    def __init__(self, name: str, x: float, y: float, width: float, height: float, points: int = 10,
+                 on_collect: Optional[Callable[['Collectible'], None]] = None):
         super().__init__(name, x, y, width, height)
         self.points = points
         self.collected = False
+        self.on_collect = on_collect
         
     def collect(self) -> int:
         if not self.collected:
             self.collected = True
             self.active = False
+            if self.on_collect:
+                self.on_collect(self)
             return self.points
         return 0
 
 class Platform(GameObject):
+    __slots__ = ('solid',)
+    _layer = 0
+    
     def __init__(self, name: str, x: float, y: float, width: float, height: float):
         super().__init__(name, x, y, width, height)
         self.solid = True
 
+class EntityArrays:
+    """Structure-of-arrays storage for object positions, velocities and patrol state"""
+    def __init__(self, objects: List[GameObject]):
+        n = len(objects)
+        self.pos_x = np.array([obj.x for obj in objects], dtype=np.float32)
+        self.pos_y = np.array([obj.y for obj in objects], dtype=np.float32)
+        self.vel_x = np.array([obj.velocity_x for obj in objects], dtype=np.float32)
+        self.vel_y = np.array([obj.velocity_y for obj in objects], dtype=np.float32)
+        self.active = np.array([obj.active for obj in objects], dtype=bool)
+        self.width = np.array([obj.width for obj in objects], dtype=np.float32)
+        self.height = np.array([obj.height for obj in objects], dtype=np.float32)
+        self.is_enemy = np.array([isinstance(obj, Enemy) for obj in objects], dtype=bool)
+        
+        # Patrol state (zero for non-enemies)
+        self.speed = np.zeros(n, dtype=np.float32)
+        self.direction = np.zeros(n, dtype=np.float32)
+        self.patrol_range = np.zeros(n, dtype=np.float32)
+        self.start_x = np.zeros(n, dtype=np.float32)
+        for idx, obj in enumerate(objects):
+            if isinstance(obj, Enemy):
+                self.speed[idx] = obj.speed
+                self.direction[idx] = obj.direction
+                self.patrol_range[idx] = obj.patrol_range
+                self.start_x[idx] = obj.start_x
+        
+        for idx, obj in enumerate(objects):
+            obj._arrays = self
+            obj.idx = idx
+    
+    def in_view(self, view: AABB) -> np.ndarray:
+        """Get a mask of active objects whose AABB overlaps the given rectangle"""
+        vx, vy, vw, vh = view
+        return (self.active
+                & (self.pos_x < vx + vw) & (self.pos_x + self.width > vx)
+                & (self.pos_y < vy + vh) & (self.pos_y + self.height > vy))
+    
+    def screen_positions(self, ox: int, oy: int) -> Tuple[List[int], List[int]]:
+        """Get integer screen coordinates of every object for an integer camera offset"""
+        return ((self.pos_x - ox).astype(np.int32).tolist(),
+                (self.pos_y - oy).astype(np.int32).tolist())
+    
+    def patrol(self, mask: np.ndarray) -> None:
+        """Run enemy patrol AI for the enemies selected by mask (others stand still)"""
+        self.vel_x[self.is_enemy & ~mask] = 0
+        step_enemies(self.pos_x, self.vel_x, self.start_x, self.direction,
+                     self.speed, self.patrol_range, self.is_enemy & mask)
+
 class PygameGameEngine:
     def __init__(self, width: int = GAME_WIDTH, height: int = GAME_HEIGHT):
         pygame.init()
@@ -126,6 +266,7 @@ class PygameGameEngine:
         
         # Game state
         self.game_state = GameState()
+        self._cached_state: Optional[Dict] = None
         self.game_type = GameType.PLATFORMER
         self.game_data: Optional[Dict] = None
         
@@ -134,11 +275,29 @@ class PygameGameEngine:
         self.enemies: List[Enemy] = []
         self.collectibles: List[Collectible] = []
         self.platforms: List[Platform] = []
-        self.all_objects: List[GameObject] = []
+        # All objects, ordered by draw layer (platforms, collectibles, enemies, player)
+        self.sprites = pygame.sprite.LayeredUpdates()
+        # Objects near the camera: platforms go into the cached scene, the rest are redrawn each frame
+        self.static_sprites = pygame.sprite.Group()
+        self.visible_sprites = pygame.sprite.Group()
+        self._visible: List[GameObject] = []
+        self.arrays = EntityArrays([])
+        self.active_collectibles = 0
+        self._had_collectibles = False
+        
+        # Static objects (platforms, collectibles) bucketed by grid cell for view culling
+        self.static_grid: Dict[Tuple[int, int], List[GameObject]] = {}
+        
+        # Broad-phase collision tree for collectibles (enemies are tested against the arrays)
+        self.world_bounds: AABB = (0.0, 0.0, float(width), float(height))
+        self.qt_collect: Optional[Quadtree] = None
         
         # Physics world (Pymunk)
         self.space = pymunk.Space()
         self.space.gravity = (0, GRAVITY)
+        # Objects moved by Pymunk bodies, whose positions are synced back every frame
+        self.moving_objects: List[GameObject] = []
+        self.moving_idx = np.zeros(0, dtype=np.intp)
         
         # Camera
         self.camera_x = 0.0
@@ -146,15 +305,32 @@ class PygameGameEngine:
         
         # Assets
         self.assets: Dict[str, pygame.Surface] = {}
+        # Scaled copies of assets keyed by (asset name, width, height)
+        self._scaled: Dict[Tuple[str, int, int], pygame.Surface] = {}
         self.background: Optional[pygame.Surface] = None
         
-        # Input state
-        self.keys_pressed = set()
+        # Input state (InputBits mask)
+        self.keys_pressed = 0
+        self._handle_input_impl: Callable[[int], None] = self._input_none
+        
+        # Cached sky, background and platforms for the current camera offset
+        self._scene: Optional[pygame.Surface] = None
+        self._scene_offset: Tuple[int, int] = (0, 0)
+        # Screen areas drawn over the scene last frame
+        self._prev_rects: List[pygame.Rect] = []
+        
+        # UI text (font created once, rendered text reused while the value is unchanged)
+        self._ui_font = pygame.font.Font(None, 36)
+        self._text_cache: Dict[Tuple, pygame.Surface] = {}
         
     async def initialize_game(self, game_data: Dict, assets: Dict[str, str]):
         """Initialize game from JSON data and asset paths"""
         self.game_data = game_data
         self.game_type = GameType(game_data.get('gameType', 'platformer'))
+        self._handle_input_impl = {
+            GameType.PLATFORMER: self._input_platformer,
+            GameType.RACING: self._input_racing,
+        }.get(self.game_type, self._input_none)
         
         print(f"🎮 Initializing {self.game_type.value} game: {game_data.get('title', 'Unknown')}")
         
@@ -165,27 +341,63 @@ class PygameGameEngine:
         self._create_entities(game_data.get('entities', []))
         self._create_level_objects(game_data.get('levels', [{}])[0])
         
+        for obj in self.sprites:
+            obj.build_image()
+        
+        # Move object state into contiguous arrays for vectorized updates
+        self.arrays = EntityArrays(self.sprites.sprites())
+        warmup_kernels()
+        
         # Initialize physics
         self._setup_physics()
         
-        print(f"✅ Game initialized: {len(self.all_objects)} objects created")
+        # Build broad-phase collision tree for static collectibles
+        self.world_bounds = self._compute_world_bounds()
+        self.qt_collect = Quadtree(self.world_bounds)
+        for collectible in self.collectibles:
+            self.qt_collect.insert(collectible, (collectible.x, collectible.y, collectible.width, collectible.height))
+        
+        self._build_static_grid()
+        
+        print(f"✅ Game initialized: {len(self.sprites)} objects created")
         
     async def _load_assets(self, asset_paths: Dict[str, str]):
         """Load all game assets"""
-        for asset_name, asset_path in asset_paths.items():
+        # Read and decode image files concurrently in worker threads
+        loop = asyncio.get_running_loop()
+        images = await asyncio.gather(
+            *[loop.run_in_executor(None, pygame.image.load, asset_path) for asset_path in asset_paths.values()],
+            return_exceptions=True
+        )
+        
+        # Convert to the display format here, since convert*() needs the main thread
+        for asset_name, image in zip(asset_paths, images):
             try:
+                if isinstance(image, Exception):
+                    raise image
                 if asset_name == 'background':
-                    self.background = pygame.image.load(asset_path).convert()
+                    self.background = image.convert()
                     self.background = pygame.transform.scale(self.background, (self.width, self.height))
                 else:
-                    surface = pygame.image.load(asset_path).convert_alpha()
+                    surface = image.convert_alpha()
                     self.assets[asset_name] = surface
                     print(f"📦 Loaded asset: {asset_name}")
             except Exception as e:
                 print(f"⚠️  Failed to load asset {asset_name}: {e}")
     
+    def _get_scaled(self, name: str, width: float, height: float) -> pygame.Surface:
+        """Get an asset scaled to the given size, scaling each distinct size only once"""
+        key = (name, int(width), int(height))
+        surface = self._scaled.get(key)
+        if surface is None:
+            scale = pygame.transform.smoothscale if SMOOTH_SCALE_SPRITES else pygame.transform.scale
+            surface = scale(self.assets[name], key[1:])
+            self._scaled[key] = surface
+        return surface
+    
     def _create_entities(self, entities: List[Dict]):
         """Create game entities from JSON data"""
+        last_added: Optional[GameObject] = None
         for entity_data in entities:
             name = entity_data.get('name', 'unnamed')
             entity_type = entity_data.get('type', 'object')
@@ -197,28 +409,24 @@ class PygameGameEngine:
             if entity_type == 'player':
                 self.player = Player(name, x, y, width, height)
                 if name in self.assets:
-                    self.player.sprite = pygame.transform.scale(self.assets[name], (int(width), int(height)))
-                self.all_objects.append(self.player)
+                    self.player.sprite = self._get_scaled(name, width, height)
+                self.sprites.add(self.player)
+                last_added = self.player
                 
             elif 'enemy' in entity_type.lower() or 'enemy' in name.lower():
                 enemy = Enemy(name, x, y, width, height)
                 if name in self.assets:
-                    enemy.sprite = pygame.transform.scale(self.assets[name], (int(width), int(height)))
+                    enemy.sprite = self._get_scaled(name, width, height)
                 self.enemies.append(enemy)
-                self.all_objects.append(enemy)
+                self.sprites.add(enemy)
+                last_added = enemy
             
             # Color fallback
-            color_str = entity_data.get('color', '#FFFFFF')
-            if color_str.startswith('#'):
-                color_str = color_str[1:]
-                color = tuple(int(color_str[i:i+2], 16) for i in (0, 2, 4))
-            else:
-                color = (255, 255, 255)
+            color = parse_hex(entity_data.get('color', '#FFFFFF')) or (255, 255, 255)
             
             # Apply color to objects without sprites
-            for obj in self.all_objects[-1:]:  # Last added object
-                if not obj.sprite:
-                    obj.color = color
+            if last_added and not last_added.sprite:
+                last_added.color = color
     
     def _create_level_objects(self, level_data: Dict):
         """Create level objects (platforms, collectibles, etc.)"""
@@ -232,13 +440,12 @@ class PygameGameEngine:
             platform = Platform(f"platform_{len(self.platforms)}", x, y, width, height)
             
             # Color
-            color_str = platform_data.get('color', '#8B4513')
-            if color_str.startswith('#'):
-                color_str = color_str[1:]
-                platform.color = tuple(int(color_str[i:i+2], 16) for i in (0, 2, 4))
+            color = parse_hex(platform_data.get('color', '#8B4513'))
+            if color:
+                platform.color = color
             
             self.platforms.append(platform)
-            self.all_objects.append(platform)
+            self.sprites.add(platform)
         
         # Create collectibles
         for collectible_data in level_data.get('collectibles', []):
@@ -248,16 +455,84 @@ class PygameGameEngine:
             height = float(collectible_data.get('height', 20))
             points = collectible_data.get('points', 10)
             
-            collectible = Collectible(f"collectible_{len(self.collectibles)}", x, y, width, height, points)
+            collectible = Collectible(f"collectible_{len(self.collectibles)}", x, y, width, height, points,
+                                      on_collect=self._on_collect)
             
             # Use collectible asset if available
             if 'collectible' in self.assets:
-                collectible.sprite = pygame.transform.scale(self.assets['collectible'], (int(width), int(height)))
+                collectible.sprite = self._get_scaled('collectible', width, height)
             else:
                 collectible.color = (255, 215, 0)  # Gold color
             
             self.collectibles.append(collectible)
-            self.all_objects.append(collectible)
+            self.sprites.add(collectible)
+        
+        self.active_collectibles = len(self.collectibles)
+        self._had_collectibles = self.active_collectibles > 0
+    
+    def _compute_world_bounds(self) -> AABB:
+        """Get an AABB enclosing the screen, all platforms and all objects"""
+        min_x, min_y = 0.0, 0.0
+        max_x, max_y = float(self.width), float(self.height)
+        for obj in self.sprites:
+            min_x = min(min_x, obj.x)
+            min_y = min(min_y, obj.y)
+            max_x = max(max_x, obj.x + obj.width)
+            max_y = max(max_y, obj.y + obj.height)
+        
+        # Leave room for enemies patrolling past the outermost objects
+        margin = max((enemy.patrol_range for enemy in self.enemies), default=0)
+        return (min_x - margin, min_y - margin, max_x - min_x + 2 * margin, max_y - min_y + 2 * margin)
+    
+    def _grid_cells(self, rect: AABB):
+        """Yield the grid cells overlapped by an AABB"""
+        x, y, w, h = rect
+        for row in range(int(y // GRID_CELL_SIZE), int((y + h) // GRID_CELL_SIZE) + 1):
+            for col in range(int(x // GRID_CELL_SIZE), int((x + w) // GRID_CELL_SIZE) + 1):
+                yield (col, row)
+    
+    def _build_static_grid(self):
+        """Bucket active platforms and collectibles into the static grid"""
+        self.static_grid = {}
+        for obj in self.platforms + self.collectibles:
+            if obj.active:
+                for cell in self._grid_cells((obj.x, obj.y, obj.width, obj.height)):
+                    self.static_grid.setdefault(cell, []).append(obj)
+    
+    def _remove_from_static_grid(self, obj: GameObject):
+        """Remove a static object (e.g. a collected item) from the grid"""
+        for cell in self._grid_cells((obj.x, obj.y, obj.width, obj.height)):
+            bucket = self.static_grid.get(cell)
+            if bucket and obj in bucket:
+                bucket.remove(obj)
+    
+    def _view_rect(self) -> AABB:
+        """Get the camera view expanded by VIEW_MARGIN on every side"""
+        return (self.camera_x - VIEW_MARGIN, self.camera_y - VIEW_MARGIN,
+                self.width + 2 * VIEW_MARGIN, self.height + 2 * VIEW_MARGIN)
+    
+    def _visible_objects(self, view: AABB) -> List[GameObject]:
+        """Get active objects overlapping the view, in draw order"""
+        vx, vy, vw, vh = view
+        visible = {}
+        for cell in self._grid_cells(view):
+            for obj in self.static_grid.get(cell, ()):
+                visible[obj.idx] = obj
+        
+        # Moving objects are few, so test them directly
+        arrays = self.arrays
+        in_view = arrays.in_view(view)
+        for obj in self.enemies:
+            if in_view[obj.idx]:
+                visible[obj.idx] = obj
+        if self.player and in_view[self.player.idx]:
+            visible[self.player.idx] = self.player
+        
+        # Grid cells are coarse, so drop static objects that only share a cell with the view
+        return [
+            obj for idx, obj in sorted(visible.items())
+            if obj.x < vx + vw and obj.x + obj.width > vx and obj.y < vy + vh and obj.y + obj.height > vy
+        ]
     
     def _setup_physics(self):
         """Setup Pymunk physics bodies"""
@@ -266,81 +541,124 @@ class PygameGameEngine:
             body = pymunk.Body(body_type=pymunk.Body.STATIC)
             shape = pymunk.Poly.create_box(body, (platform.width, platform.height))
             shape.friction = FRICTION
+            shape.collision_type = PLATFORM_COLLISION_TYPE
             body.position = platform.x + platform.width/2, platform.y + platform.height/2
             self.space.add(body, shape)
         
         # Create physics body for player
         if self.player:
             mass = 10
-            moment = pymunk.moment_for_box(mass, (self.player.width, self.player.height))
-            body = pymunk.Body(mass, moment)
+            # Infinite moment keeps the player upright now that Pymunk drives its movement
+            body = pymunk.Body(mass, float('inf'))
             shape = pymunk.Poly.create_box(body, (self.player.width, self.player.height))
             shape.friction = FRICTION
+            shape.collision_type = PLAYER_COLLISION_TYPE
             body.position = self.player.x + self.player.width/2, self.player.y + self.player.height/2
             self.space.add(body, shape)
             self.player.physics_body = body
             self.player.physics_shape = shape
+            self.moving_objects.append(self.player)
+            
+            # Track ground contacts as the player touches platforms (re-checked each step, as the normal can change)
+            handler = self.space.add_collision_handler(PLAYER_COLLISION_TYPE, PLATFORM_COLLISION_TYPE)
+            handler.begin = self._on_ground_contact
+            handler.pre_solve = self._on_ground_contact
+            handler.separate = self._on_ground_end
+        
+        # Create kinematic bodies for enemies (sensors, so they don't push the player around)
+        for enemy in self.enemies:
+            body = pymunk.Body(body_type=pymunk.Body.KINEMATIC)
+            shape = pymunk.Poly.create_box(body, (enemy.width, enemy.height))
+            shape.sensor = True
+            body.position = enemy.x + enemy.width/2, enemy.y + enemy.height/2
+            self.space.add(body, shape)
+            enemy.physics_body = body
+            enemy.physics_shape = shape
+            self.moving_objects.append(enemy)
+        
+        self.moving_idx = np.array([obj.idx for obj in self.moving_objects], dtype=np.intp)
+    
+    def _on_ground_contact(self, arbiter, space, data) -> bool:
+        """Count the platform as ground only while the player rests on top of it (not its sides or underside)"""
+        platform_shape = arbiter.shapes[1]
+        if arbiter.normal.y >= GROUND_NORMAL_MIN_Y:
+            self.player.ground_shapes.add(platform_shape)
+        else:
+            self.player.ground_shapes.discard(platform_shape)
+        return True
+    
+    def _on_ground_end(self, arbiter, space, data):
+        self.player.ground_shapes.discard(arbiter.shapes[1])
     
-    def handle_input(self, keys: set):
-        """Handle input for game"""
+    def handle_input(self, keys: int) -> None:
+        """Handle input for game (keys is an InputBits mask)"""
         self.keys_pressed = keys
         
         if not self.player:
             return
+        
+        # Movement handler for the game type, chosen once in initialize_game
+        self._handle_input_impl(keys)
+    
+    def _input_platformer(self, keys: int) -> None:
+        if keys & InputBits.LEFT:
+            self.player.move_left(self.dt)
+        elif keys & InputBits.RIGHT:
+            self.player.move_right(self.dt)
+        else:
+            self.player.stop_horizontal()
+        
+        if keys & (InputBits.UP | InputBits.JUMP):
+            self.player.jump()
+    
+    def _input_racing(self, keys: int) -> None:
+        if keys & InputBits.UP:
+            self.player.velocity_y = -MOVE_SPEED
+        elif keys & InputBits.DOWN:
+            self.player.velocity_y = MOVE_SPEED
+        else:
+            self.player.velocity_y *= 0.9
             
-        # Movement based on game type
-        if self.game_type == GameType.PLATFORMER:
-            if 'left' in keys or 'a' in keys:
-                self.player.move_left(self.dt)
-            elif 'right' in keys or 'd' in keys:
-                self.player.move_right(self.dt)
-            else:
-                self.player.stop_horizontal()
-            
-            if 'up' in keys or 'w' in keys or 'space' in keys:
-                self.player.jump()
-                
-        elif self.game_type == GameType.RACING:
-            if 'up' in keys or 'w' in keys:
-                self.player.velocity_y = -MOVE_SPEED
-            elif 'down' in keys or 's' in keys:
-                self.player.velocity_y = MOVE_SPEED
-            else:
-                self.player.velocity_y *= 0.9
-                
-            if 'left' in keys or 'a' in keys:
-                self.player.velocity_x = -MOVE_SPEED
-            elif 'right' in keys or 'd' in keys:
-                self.player.velocity_x = MOVE_SPEED
-            else:
-                self.player.velocity_x *= 0.9
+        if keys & InputBits.LEFT:
+            self.player.velocity_x = -MOVE_SPEED
+        elif keys & InputBits.RIGHT:
+            self.player.velocity_x = MOVE_SPEED
+        else:
+            self.player.velocity_x *= 0.9
+    
+    def _input_none(self, keys: int) -> None:
+        """Game types without player movement controls ignore input"""
     
-    def update(self, dt: float):
+    def update(self, dt: float) -> None:
         """Update game state"""
         self.dt = dt
         self.game_state.time += dt
+        self._cached_state = None
         
-        # Update physics
-        self.space.step(dt)
-        
-        # Sync player position with physics
+        # Run patrol AI for enemies near the camera and hand all velocities to Pymunk
+        arrays = self.arrays
+        arrays.patrol(arrays.in_view(self._view_rect()))
+        for enemy in self.enemies:
+            enemy.physics_body.velocity = (enemy.velocity_x, 0.0)
         if self.player and hasattr(self.player, 'physics_body'):
-            pos = self.player.physics_body.position
-            self.player.x = pos.x - self.player.width/2
-            self.player.y = pos.y - self.player.height/2
-            
-            # Check if on ground
-            self.player.on_ground = abs(self.player.physics_body.velocity.y) < 10
+            # Re-apply held keys: input only arrives on key changes, and friction slows the synced velocity each step
+            self._handle_input_impl(self.keys_pressed)
+            self.player.physics_body.velocity = (self.player.velocity_x, self.player.velocity_y)
         
-        # Update all objects
-        for obj in self.all_objects:
-            if obj.active:
-                obj.update(dt)
+        # Update physics (Pymunk integrates every moving object)
+        self.space.step(dt)
         
-        # Update enemies
-        for enemy in self.enemies:
-            if enemy.active:
-                enemy.update(dt)
+        # Sync positions of moving objects from their bodies
+        if self.moving_objects:
+            idx = self.moving_idx
+            centers = np.array([obj.physics_body.position for obj in self.moving_objects], dtype=np.float32)
+            arrays.pos_x[idx] = centers[:, 0] - arrays.width[idx] / 2
+            arrays.pos_y[idx] = centers[:, 1] - arrays.height[idx] / 2
+        
+        if self.player and hasattr(self.player, 'physics_body'):
+            velocity = self.player.physics_body.velocity
+            self.player.velocity_x = velocity.x
+            self.player.velocity_y = velocity.y
         
         # Check collisions
         self._check_collisions()
@@ -351,44 +669,44 @@ class PygameGameEngine:
         # Check win/lose conditions
         self._check_game_conditions()
     
-    def _check_collisions(self):
+    def _check_collisions(self) -> None:
         """Check game object collisions"""
         if not self.player:
             return
             
-        player_rect = pygame.Rect(self.player.x, self.player.y, self.player.width, self.player.height)
+        player_rect = (self.player.x, self.player.y, self.player.width, self.player.height)
         
         # Check collectible collisions
-        for collectible in self.collectibles:
+        for collectible in self.qt_collect.query(player_rect):
             if collectible.active:
-                coll_rect = pygame.Rect(collectible.x, collectible.y, collectible.width, collectible.height)
-                if player_rect.colliderect(coll_rect):
-                    points = collectible.collect()
-                    self.game_state.score += points
-        
-        # Check enemy collisions
-        for enemy in self.enemies:
-            if enemy.active:
-                enemy_rect = pygame.Rect(enemy.x, enemy.y, enemy.width, enemy.height)
-                if player_rect.colliderect(enemy_rect):
-                    self.player.health -= 10
-                    if self.player.health <= 0:
-                        self.game_state.game_over = True
-    
-    def _update_camera(self):
+                self.game_state.score += collectible.collect()
+        
+        # Enemies move every frame, so test them all at once against the SoA arrays
+        arrays = self.arrays
+        hits = int(np.count_nonzero(arrays.in_view(player_rect) & arrays.is_enemy))
+        if hits:
+            self.player.health -= 10 * hits
+            if self.player.health <= 0:
+                self.game_state.game_over = True
+    
+    def _on_collect(self, collectible: Collectible) -> None:
+        """Keep the remaining-collectible count and the view grid in step with collection"""
+        self.active_collectibles -= 1
+        self._remove_from_static_grid(collectible)
+    
+    def _update_camera(self) -> None:
         """Update camera to follow player"""
         if self.player:
-            target_x = self.player.x - self.width // 2
-            target_y = self.player.y - self.height // 2
-            
             # Smooth camera movement
-            self.camera_x += (target_x - self.camera_x) * 0.1
-            self.camera_y += (target_y - self.camera_y) * 0.1
+            self.camera_x, self.camera_y = step_camera(
+                self.camera_x, self.camera_y, self.player.x, self.player.y,
+                float(self.width // 2), float(self.height // 2)
+            )
     
-    def _check_game_conditions(self):
+    def _check_game_conditions(self) -> None:
         """Check win/lose conditions"""
         # Win condition: collect all items
-        if all(not c.active for c in self.collectibles) and len(self.collectibles) > 0:
+        if self.active_collectibles == 0 and self._had_collectibles:
             self.game_state.win = True
         
         # Lose condition: fall off the world
@@ -396,55 +714,116 @@ class PygameGameEngine:
             self.game_state.game_over = True
     
     def render(self) -> pygame.Surface:
-        """Render game frame"""
-        # Clear screen
-        self.screen.fill((135, 206, 235))  # Sky blue default
-        
-        # Draw background
-        if self.background:
-            self.screen.blit(self.background, (0, 0))
-        
-        # Draw all objects with camera offset
-        camera_offset = (self.camera_x, self.camera_y)
+        """Render game frame, redrawing only dirty areas while the camera holds still"""
+        ox, oy = math.floor(self.camera_x), math.floor(self.camera_y)
+        screen_pos = self.arrays.screen_positions(ox, oy)
+        screen_rect = self.screen.get_rect()
+        
+        # Only objects near the screen are drawn
+        visible = self._visible_objects(self._view_rect())
+        if visible != self._visible:
+            self._visible = visible
+            self.visible_sprites.empty()
+            self.visible_sprites.add(*[obj for obj in visible if not isinstance(obj, Platform)])
+        moving = self.visible_sprites.sprites()
+        self._place_sprites(moving, screen_pos)
+        moving_rects = [rect for rect in (obj.rect.clip(screen_rect) for obj in moving) if rect.w and rect.h]
+        
+        # Restore the scene under last frame's sprites and UI, or redraw everything
+        scene_valid = self._scene is not None and self._scene_offset == (ox, oy)
+        full = not scene_valid
+        if scene_valid:
+            dirty_area = sum(r.w * r.h for r in self._prev_rects) + sum(r.w * r.h for r in moving_rects)
+            full = dirty_area > DIRTY_AREA_LIMIT * self.width * self.height
+        
+        if full:
+            if not scene_valid:
+                self._build_scene(visible, ox, oy, screen_pos)
+            self.screen.blit(self._scene, (0, 0))
+        else:
+            for rect in self._prev_rects:
+                self.screen.blit(self._scene, rect, rect)
         
-        for obj in self.all_objects:
-            if obj.active:
-                obj.render(self.screen, camera_offset)
+        self.visible_sprites.draw(self.screen)
         
         # Draw UI
-        self._render_ui()
+        ui_rects = self._render_ui()
         
+        self._prev_rects = moving_rects + ui_rects
         return self.screen
     
-    def _render_ui(self):
-        """Render game UI"""
-        font = pygame.font.Font(None, 36)
+    def _place_sprites(self, objects: List[GameObject], screen_pos: Tuple[List[int], List[int]]) -> None:
+        """Move sprite rects to their precomputed on-screen positions"""
+        screen_x, screen_y = screen_pos
+        for obj in objects:
+            obj.rect.topleft = (screen_x[obj.idx], screen_y[obj.idx])
+    
+    def _build_scene(self, visible: List[GameObject], ox: int, oy: int, screen_pos: Tuple[List[int], List[int]]):
+        """Draw sky, background and visible platforms into the cached scene surface"""
+        if self._scene is None:
+            self._scene = pygame.Surface((self.width, self.height))
+        self._scene_offset = (ox, oy)
+        
+        # Clear screen
+        self._scene.fill((135, 206, 235))  # Sky blue default
+        
+        # Draw background
+        if self.background:
+            self._scene.blit(self.background, (0, 0))
+        
+        platforms = [obj for obj in visible if isinstance(obj, Platform)]
+        self._place_sprites(platforms, screen_pos)
+        self.static_sprites.empty()
+        self.static_sprites.add(*platforms)
+        self.static_sprites.draw(self._scene)
+    
+    def _render_ui(self) -> List[pygame.Rect]:
+        """Render game UI and return the screen areas it covers"""
+        rects = []
         
         # Score
-        score_text = font.render(f"Score: {self.game_state.score}", True, (255, 255, 255))
-        self.screen.blit(score_text, (10, 10))
+        score_text = self._text(('score', self.game_state.score), f"Score: {self.game_state.score}", (255, 255, 255))
+        rects.append(self.screen.blit(score_text, (10, 10)))
         
         # Health
         if self.player:
-            health_text = font.render(f"Health: {self.player.health}", True, (255, 255, 255))
-            self.screen.blit(health_text, (10, 50))
+            health_text = self._text(('health', self.player.health), f"Health: {self.player.health}", (255, 255, 255))
+            rects.append(self.screen.blit(health_text, (10, 50)))
         
         # Time
-        time_text = font.render(f"Time: {int(self.game_state.time)}", True, (255, 255, 255))
-        self.screen.blit(time_text, (10, 90))
+        seconds = int(self.game_state.time)
+        time_text = self._text(('time', seconds), f"Time: {seconds}", (255, 255, 255))
+        rects.append(self.screen.blit(time_text, (10, 90)))
         
         # Game over / Win
         if self.game_state.game_over:
-            game_over_text = font.render("GAME OVER", True, (255, 0, 0))
+            game_over_text = self._text(('game_over',), "GAME OVER", (255, 0, 0))
             text_rect = game_over_text.get_rect(center=(self.width//2, self.height//2))
-            self.screen.blit(game_over_text, text_rect)
+            rects.append(self.screen.blit(game_over_text, text_rect))
         elif self.game_state.win:
-            win_text = font.render("YOU WIN!", True, (0, 255, 0))
+            win_text = self._text(('win',), "YOU WIN!", (0, 255, 0))
             text_rect = win_text.get_rect(center=(self.width//2, self.height//2))
-            self.screen.blit(win_text, text_rect)
+            rects.append(self.screen.blit(win_text, text_rect))
+        
+        return rects
+    
+    def _text(self, key: Tuple, text: str, color: Tuple[int, int, int]) -> pygame.Surface:
+        """Get rendered UI text, re-rendering only when the key changes"""
+        surface = self._text_cache.get(key)
+        if surface is None:
+            if len(self._text_cache) >= 256:
+                self._text_cache.clear()
+            surface = self._ui_font.render(text, True, color)
+            self._text_cache[key] = surface
+        return surface
     
     def get_game_state(self) -> Dict:
-        """Get current game state as dict"""
+        """Get current game state as dict (built once per tick and shared until the next update)"""
+        if self._cached_state is None:
+            self._cached_state = self._build_game_state()
+        return self._cached_state
+    
+    def _build_game_state(self) -> Dict:
         return {
             'score': self.game_state.score,
             'health': self.player.health if self.player else 100,
@@ -458,6 +837,7 @@ class PygameGameEngine:
     def reset_game(self):
         """Reset game to initial state"""
         self.game_state = GameState()
+        self._cached_state = None
         if self.player:
             self.player.health = 100
             # Reset player position
@@ -469,6 +849,8 @@ class PygameGameEngine:
         for collectible in self.collectibles:
             collectible.active = True
             collectible.collected = False
+        self.active_collectibles = len(self.collectibles)
+        self._build_static_grid()
     
     def quit(self):
         """Clean up and quit"""
@@ -1,23 +1,42 @@
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, Header, HTTPException, Query, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 from pydantic import BaseModel
+from PIL import Image
 import pygame
 import asyncio
 import json
 import base64
+import hashlib
 import io
+import itertools
 import os
+import queue
+import re
+import shutil
+import struct
+import sys
 import time
-from typing import Dict, List, Optional
+import httpx
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Union
 import uvicorn
 
 from config import *
-from game_engine import PygameGameEngine
-from asset_manager import asset_manager
+from game_engine import PygameGameEngine, InputBits
+from asset_manager import get_asset_manager, close_asset_manager
+
+try:
+    import orjson
+except ImportError:  # Fall back to stdlib json
+    orjson = None
 
 # Initialize FastAPI app
-app = FastAPI(title="AI Game Engine Backend", version="1.0.0")
+app = FastAPI(
+    title="AI Game Engine Backend",
+    version="1.0.0",
+    default_response_class=ORJSONResponse if orjson else JSONResponse
+)
 
 # Add CORS middleware
 app.add_middleware(
@@ -28,10 +47,229 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# JPEG quality for streamed frames (PNG is only used for single-frame snapshots)
+STREAM_JPEG_QUALITY = 80
+# WebSocket frames are sent in batches of up to this many frames, or this old
+WS_BATCH_FRAMES = 2
+WS_BATCH_SECONDS = 0.033
+
+# Parsed save files keyed by path, with the mtime they were read at (least recently used first)
+SAVE_CACHE_SIZE = 128
+_save_cache: "OrderedDict[str, Tuple[int, object, str]]" = OrderedDict()
+
+# Reusable frame buffers (pixel snapshots and encoder output), shared across requests and threads
+_PIXEL_POOL: queue.LifoQueue = queue.LifoQueue()
+_BYTES_IO_POOL: queue.LifoQueue = queue.LifoQueue()
+
+# PIL raw modes for 24/32-bit surface layouts that can be copied without conversion, keyed by bytes per pixel and RGB masks
+_RAW_MODES = {
+    (4, (0xFF0000, 0xFF00, 0xFF)): 'BGRX',
+    (4, (0xFF, 0xFF00, 0xFF0000)): 'RGBX',
+    (3, (0xFF0000, 0xFF00, 0xFF)): 'BGR',
+    (3, (0xFF, 0xFF00, 0xFF0000)): 'RGB',
+} if sys.byteorder == 'little' else {}
+
+def _pooled(pool: queue.LifoQueue, factory):
+    """Get a buffer from a pool, or create one if the pool is empty"""
+    try:
+        return pool.get_nowait()
+    except queue.Empty:
+        return factory()
+
+def _surface_raw_mode(surface: pygame.Surface) -> Optional[str]:
+    """Get the PIL raw mode for reading the surface's pixel memory directly, if its layout allows it"""
+    bytesize = surface.get_bytesize()
+    if surface.get_pitch() != surface.get_width() * bytesize:
+        return None
+    return _RAW_MODES.get((bytesize, surface.get_masks()[:3]))
+
+def snapshot_frame(surface: pygame.Surface) -> Tuple[Union[bytearray, bytes], str]:
+    """Copy the surface's pixels into a pooled buffer, returning it with its PIL raw mode"""
+    raw_mode = _surface_raw_mode(surface)
+    if raw_mode is None:
+        # Other layouts (palette, 16-bit, padded rows): tobytes is already packed row-major RGB, so PIL reads it as-is
+        return pygame.image.tobytes(surface, 'RGB'), 'RGB'
+    
+    # The view keeps the surface locked only for the duration of the copy
+    with memoryview(surface.get_view('0')) as src:
+        pixels = _pooled(_PIXEL_POOL, lambda: bytearray(src.nbytes))
+        if len(pixels) != src.nbytes:
+            pixels = bytearray(src.nbytes)
+        pixels[:] = src
+    return pixels, raw_mode
+
+def encode_frame(pixels: Union[bytearray, bytes, memoryview], raw_mode: str, size: Tuple[int, int], to_base64: bool,
+                 **save_params):
+    """Encode a frame snapshot to image bytes (or base64 text) and return its buffers to the pools"""
+    img_buffer = _pooled(_BYTES_IO_POOL, io.BytesIO)
+    try:
+        img_buffer.seek(0)
+        img_buffer.truncate(0)
+        pil_image = Image.frombuffer('RGB', size, pixels, 'raw', raw_mode, 0, 1)
+        pil_image.save(img_buffer, **save_params)
+        with img_buffer.getbuffer() as encoded:
+            return base64.b64encode(encoded).decode() if to_base64 else bytes(encoded)
+    finally:
+        if isinstance(pixels, bytearray):
+            _PIXEL_POOL.put(pixels)
+        _BYTES_IO_POOL.put(img_buffer)
+
+def encode_surface(surface: pygame.Surface, **save_params) -> bytes:
+    """Encode a surface straight from its pixel memory (nothing may draw to it until this returns)"""
+    raw_mode = _surface_raw_mode(surface)
+    if raw_mode is None:
+        return encode_frame(pygame.image.tobytes(surface, 'RGB'), 'RGB', surface.get_size(), False, **save_params)
+    with memoryview(surface.get_view('0')) as pixels:
+        return encode_frame(pixels, raw_mode, surface.get_size(), False, **save_params)
+
+def encode_stream_jpeg(pixels: Union[bytearray, bytes], raw_mode: str, size: Tuple[int, int]) -> bytes:
+    """Encode a frame snapshot as JPEG bytes"""
+    return encode_frame(pixels, raw_mode, size, False,
+                        format='JPEG', quality=STREAM_JPEG_QUALITY, optimize=False)
+
+def encode_stream_frame(pixels: Union[bytearray, bytes], raw_mode: str, size: Tuple[int, int]) -> str:
+    """Encode a frame snapshot as a base64 JPEG string"""
+    return encode_frame(pixels, raw_mode, size, True,
+                        format='JPEG', quality=STREAM_JPEG_QUALITY, optimize=False)
+
+def read_save_file(path: str, mtime_ns: int) -> Tuple[object, str]:
+    """Parse a saved game/metadata file and get its ETag, reusing the cached result while the file is unmodified"""
+    cached = _save_cache.get(path)
+    if cached is not None and cached[0] == mtime_ns:
+        _save_cache.move_to_end(path)
+        return cached[1], cached[2]
+    
+    with open(path, 'rb') as f:
+        data = f.read()
+    value = orjson.loads(data) if orjson else json.loads(data)
+    etag = content_etag(data)
+    
+    _save_cache[path] = (mtime_ns, value, etag)
+    _save_cache.move_to_end(path)
+    if len(_save_cache) > SAVE_CACHE_SIZE:
+        _save_cache.popitem(last=False)
+    return value, etag
+
+def write_json_atomic(path: str, value) -> bytes:
+    """Write indented JSON in one call via a temp file and rename, returning the bytes written"""
+    data = orjson.dumps(value, option=orjson.OPT_INDENT_2) if orjson else json.dumps(value, indent=2).encode()
+    tmp_file = f"{path}.tmp"
+    with open(tmp_file, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_file, path)
+    return data
+
+def content_etag(data: bytes) -> str:
+    """Get a short content hash used as an ETag"""
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header value against an ETag"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == '*' or candidate.strip('"') == etag:
+            return True
+    return False
+
+async def send_ws_json(websocket: WebSocket, payload: Dict):
+    """Send a JSON text message over the WebSocket (binary messages are reserved for frames)"""
+    if orjson:
+        await websocket.send_text(orjson.dumps(payload).decode())
+    else:
+        await websocket.send_json(payload)
+
+async def send_ws_frames(websocket: WebSocket, header: Dict, frames: List[bytes]):
+    """Send a batch of JPEG frames as one binary WebSocket message.
+
+    Layout: little-endian uint32 header length, the JSON header (frame_sizes, states,
+    timestamps), then the JPEG files back to back in the order of frame_sizes.
+    """
+    header_json = orjson.dumps(header) if orjson else json.dumps(header).encode()
+    await websocket.send_bytes(b''.join([struct.pack('<I', len(header_json)), header_json, *frames]))
+
 # Global game engine instance
 game_engine: Optional[PygameGameEngine] = None
 game_running = False
 
+# Browser key codes (lowercased) to the key names the game engine understands
+_KEY_MAP = {
+    'arrowleft': 'left', 'keya': 'left',
+    'arrowright': 'right', 'keyd': 'right',
+    'arrowup': 'up', 'keyw': 'up',
+    'arrowdown': 'down', 'keys': 'down',
+    'space': 'space',
+}
+
+# JSON extraction patterns for DeepSeek replies, most specific first (the greedy
+# brace match backtracks heavily on long replies, so it is only the last resort)
+_JSON_PATTERNS = [
+    re.compile(r'```json\s*(\{[\s\S]*?\})\s*```', re.MULTILINE | re.DOTALL),  # JSON in code blocks
+    re.compile(r'```\s*(\{[\s\S]*?\})\s*```', re.MULTILINE | re.DOTALL),  # Generic code blocks
+]
+_JSON_SCAN_TOKENS = re.compile(r'[{}"\\]')
+_TRAILING_COMMA_OBJ = re.compile(r',\s*}')
+_TRAILING_COMMA_ARR = re.compile(r',\s*]')
+
+def find_json_objects(text: str):
+    """Yield each top-level balanced {...} span in the text, in one linear pass (braces inside JSON strings are ignored)"""
+    depth = 0
+    start = 0
+    in_string = False
+    escaped_at = -1
+    for token in _JSON_SCAN_TOKENS.finditer(text):
+        char, pos = token.group(), token.start()
+        if in_string:
+            if char == '\\' and escaped_at != pos:
+                escaped_at = pos + 1
+            elif char == '"' and escaped_at != pos:
+                in_string = False
+        elif char == '{':
+            if depth == 0:
+                start = pos
+            depth += 1
+        elif depth == 0:
+            continue  # Quotes and stray closing braces in the surrounding prose
+        elif char == '"':
+            in_string = True
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                yield text[start:pos + 1]
+
+# Pooled async HTTP client for DeepSeek, created on startup and closed on shutdown
+_deepseek_client: Optional[httpx.AsyncClient] = None
+
+# Last base64 frame with the game state fingerprint it was rendered at
+_last_frame_cache: Optional[Tuple[tuple, str]] = None
+
+# Monotonic time the frame endpoints have simulated the game up to
+_last_update_t = time.monotonic()
+MAX_TICK_STEPS = 8  # Fixed steps run per poll at most (~133 ms at 60 FPS); older time is dropped
+
+def reset_tick_clock():
+    """Start simulating from now, so a new or reset game doesn't catch up on time that passed before it"""
+    global _last_update_t
+    _last_update_t = time.monotonic()
+
+def tick_game():
+    """Advance the game in fixed 1/FPS steps (Pymunk tunnels through platforms on long steps) to catch up with real time"""
+    global _last_update_t
+    now = time.monotonic()
+    steps = int((now - _last_update_t) * FPS)
+    if steps > MAX_TICK_STEPS:
+        # Too far behind (polling stopped or stalled): run the capped steps and drop the rest
+        _last_update_t = now
+        steps = MAX_TICK_STEPS
+    else:
+        # Carry the leftover fraction of a frame over to the next poll
+        _last_update_t += steps / FPS
+    for _ in range(steps):
+        game_engine.update(1.0 / FPS)
+
 # Pydantic models
 class GameData(BaseModel):
     title: str
@@ -55,11 +293,29 @@ class GameStateResponse(BaseModel):
     win: bool
     fps: float
 
+def _get_deepseek_client() -> httpx.AsyncClient:
+    """Get the shared DeepSeek HTTP client (keeps TLS connections alive between requests)"""
+    global _deepseek_client
+    if _deepseek_client is None:
+        _deepseek_client = httpx.AsyncClient(
+            timeout=60.0,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+        )
+    return _deepseek_client
+
+async def _close_deepseek_client():
+    """Close the shared DeepSeek HTTP client"""
+    global _deepseek_client
+    if _deepseek_client is not None:
+        await _deepseek_client.aclose()
+        _deepseek_client = None
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize pygame and game systems"""
     pygame.init()
     pygame.display.set_mode((1, 1))  # Minimal display for headless operation
+    _get_deepseek_client()
     print("AI Game Engine Backend Started")
     print(f"Server running on {BACKEND_HOST}:{BACKEND_PORT}")
 
@@ -69,6 +325,8 @@ async def shutdown_event():
     global game_engine
     if game_engine:
         game_engine.quit()
+    await close_asset_manager()
+    await _close_deepseek_client()
     pygame.quit()
     print("Backend shutdown complete")
 
@@ -86,6 +344,7 @@ async def initialize_game(game_data: GameData):
         
         # Generate optimized assets (max 5 DALL-E requests)
         print("🎨 Starting asset generation...")
+        asset_manager = get_asset_manager()
         assets = await asset_manager.generate_game_assets(game_data.dict())
         
         # Create new game engine instance
@@ -93,6 +352,7 @@ async def initialize_game(game_data: GameData):
         
         # Initialize game with data and assets
         await game_engine.initialize_game(game_data.dict(), assets)
+        reset_tick_clock()
         
         game_running = True
         
@@ -120,23 +380,10 @@ async def handle_game_input(input_data: GameInput):
     
     try:
         # Convert key names to standardized format
-        keys = set()
-        for key in input_data.keys:
-            if key.lower() in ['arrowleft', 'keya']:
-                keys.add('left')
-            elif key.lower() in ['arrowright', 'keyd']:
-                keys.add('right')
-            elif key.lower() in ['arrowup', 'keyw']:
-                keys.add('up')
-            elif key.lower() in ['arrowdown', 'keys']:
-                keys.add('down')
-            elif key.lower() in ['space']:
-                keys.add('space')
-            else:
-                keys.add(key.lower())
+        keys = {_KEY_MAP.get(key, key) for key in map(str.lower, input_data.keys)}
         
         # Handle input in game engine
-        game_engine.handle_input(keys)
+        game_engine.handle_input(InputBits.from_names(keys))
         
         return {"success": True, "keys_processed": list(keys)}
         
@@ -167,62 +414,51 @@ async def get_game_frame():
         raise HTTPException(status_code=400, detail="No game initialized")
     
     try:
-        # Update game (simulate one frame)
-        game_engine.update(1.0 / FPS)
+        # Update game (polls faster than FPS reuse the current frame's state)
+        tick_game()
         
         # Render frame
         surface = game_engine.render()
         
-        # Convert pygame surface to PNG bytes
-        img_str = pygame.image.tostring(surface, 'RGB')
-        img_array = pygame.surfarray.array3d(surface)
-        img_array = img_array.swapaxes(0, 1)
-        
-        # Create PIL image and convert to bytes
-        from PIL import Image
-        pil_image = Image.fromarray(img_array)
-        
-        # Save to bytes buffer
-        img_buffer = io.BytesIO()
-        pil_image.save(img_buffer, format='PNG')
-        img_buffer.seek(0)
+        # Convert pygame surface to PNG bytes (fastest zlib level; higher levels barely shrink game frames).
+        # Encoding runs without yielding to the event loop, so it can read the surface memory in place.
+        png_bytes = encode_surface(surface, format='PNG', compress_level=1)
         
-        return StreamingResponse(img_buffer, media_type="image/png")
+        return Response(content=png_bytes, media_type="image/png")
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Frame generation failed: {str(e)}")
 
 @app.get("/api/game/frame/base64")
 async def get_game_frame_base64():
-    """Get current game frame as base64 encoded image"""
-    global game_engine
+    """Get current game frame as base64 encoded JPEG image"""
+    global game_engine, _last_frame_cache
     
     if not game_engine:
         raise HTTPException(status_code=400, detail="No game initialized")
     
     try:
         # Update game
-        game_engine.update(1.0 / FPS)
-        
-        # Render frame
-        surface = game_engine.render()
-        
-        # Convert to base64
-        img_str = pygame.image.tostring(surface, 'RGB')
-        img_array = pygame.surfarray.array3d(surface)
-        img_array = img_array.swapaxes(0, 1)
-        
-        from PIL import Image
-        pil_image = Image.fromarray(img_array)
+        tick_game()
+        state = game_engine.get_game_state()
         
-        img_buffer = io.BytesIO()
-        pil_image.save(img_buffer, format='PNG')
-        img_base64 = base64.b64encode(img_buffer.getvalue()).decode()
+        # Reuse the last encoded frame if the game hasn't moved on since it was made
+        fingerprint = (id(game_engine), state['time'], state['score'], state['health'], state['level'])
+        if _last_frame_cache is not None and _last_frame_cache[0] == fingerprint:
+            img_base64 = _last_frame_cache[1]
+        else:
+            # Render frame
+            surface = game_engine.render()
+            
+            # Convert to base64
+            pixels, raw_mode = snapshot_frame(surface)
+            img_base64 = encode_stream_frame(pixels, raw_mode, surface.get_size())
+            _last_frame_cache = (fingerprint, img_base64)
         
         return {
             "success": True,
-            "frame": f"data:image/png;base64,{img_base64}",
-            "game_state": game_engine.get_game_state()
+            "frame": f"data:image/jpeg;base64,{img_base64}",
+            "game_state": state
         }
         
     except Exception as e:
@@ -238,6 +474,7 @@ async def reset_game():
     
     try:
         game_engine.reset_game()
+        reset_tick_clock()
         return {"success": True, "message": "Game reset successfully"}
         
     except Exception as e:
@@ -247,6 +484,7 @@ async def reset_game():
 async def get_asset_cache_info():
     """Get information about cached assets"""
     try:
+        asset_manager = get_asset_manager()
         cache_size = len(asset_manager.asset_cache)
         return {
             "cached_assets": cache_size,
@@ -260,11 +498,9 @@ async def get_asset_cache_info():
 async def clear_asset_cache():
     """Clear all cached assets"""
     try:
-        import os
-        import shutil
-        
         # Clear in-memory cache
-        asset_manager.asset_cache.clear()
+        asset_manager = get_asset_manager()
+        asset_manager.clear_memory_cache()
         
         # Clear disk cache
         if os.path.exists(asset_manager.cache_dir):
@@ -317,8 +553,7 @@ IMPROVED GAME JSON:
 """
 
         # Send to DeepSeek for improvement
-        import requests
-        response = requests.post(
+        response = await _get_deepseek_client().post(
             "https://api.deepseek.com/v1/chat/completions",
             headers={
                 "Authorization": f"Bearer {DEEPSEEK_API_KEY}",
@@ -332,38 +567,32 @@ IMPROVED GAME JSON:
             }
         )
         
-        if response.ok:
-            data = response.json()
+        if response.is_success:
+            data = orjson.loads(response.content) if orjson else response.json()
             improved_content = data['choices'][0]['message']['content']
             
             # Parse the improved game JSON with better error handling
-            import re
             print(f"🔍 DeepSeek response: {improved_content[:500]}...")
             
-            # Try multiple JSON extraction methods
-            json_patterns = [
-                r'\{[\s\S]*\}',  # Original pattern
-                r'```json\s*(\{[\s\S]*?\})\s*```',  # JSON in code blocks
-                r'```\s*(\{[\s\S]*?\})\s*```',  # Generic code blocks
-            ]
-            
+            # Try multiple JSON extraction methods: code blocks first, then any balanced braces
             improved_game = None
-            for pattern in json_patterns:
-                json_match = re.search(pattern, improved_content, re.MULTILINE | re.DOTALL)
-                if json_match:
-                    try:
-                        json_str = json_match.group(1) if json_match.lastindex else json_match.group(0)
-                        # Clean up common JSON issues
-                        json_str = json_str.strip()
-                        json_str = re.sub(r',\s*}', '}', json_str)  # Remove trailing commas
-                        json_str = re.sub(r',\s*]', ']', json_str)  # Remove trailing commas in arrays
-                        
-                        improved_game = json.loads(json_str)
-                        print(f"✅ Game improved successfully: {improved_game.get('title', 'Unknown')}")
-                        break
-                    except json.JSONDecodeError as e:
-                        print(f"⚠️ JSON parse failed with pattern {pattern}: {str(e)}")
+            candidates = [match.group(1) for match in (pattern.search(improved_content) for pattern in _JSON_PATTERNS) if match]
+            for json_str in itertools.chain(candidates, find_json_objects(improved_content)):
+                try:
+                    # Clean up common JSON issues
+                    json_str = json_str.strip()
+                    json_str = _TRAILING_COMMA_OBJ.sub('}', json_str)  # Remove trailing commas
+                    json_str = _TRAILING_COMMA_ARR.sub(']', json_str)  # Remove trailing commas in arrays
+                    
+                    improved_game = orjson.loads(json_str) if orjson else json.loads(json_str)
+                    if not isinstance(improved_game, dict):
+                        improved_game = None
                         continue
+                    print(f"✅ Game improved successfully: {improved_game.get('title', 'Unknown')}")
+                    break
+                except json.JSONDecodeError as e:
+                    print(f"⚠️ JSON parse failed for candidate {json_str[:60]!r}: {str(e)}")
+                    continue
             
             if improved_game:
                 return improved_game
@@ -407,15 +636,15 @@ async def save_game(request_data: dict):
         saves_dir = os.path.join(os.getcwd(), "saved_games")
         os.makedirs(saves_dir, exist_ok=True)
         
-        # Save game data
+        # Save game data (its content hash is the ETag clients revalidate loads with)
         game_file = os.path.join(saves_dir, f"game_{save_id}.json")
-        with open(game_file, 'w') as f:
-            json.dump(game_data, f, indent=2)
+        _save_cache.pop(game_file, None)
+        save_data['etag'] = content_etag(write_json_atomic(game_file, game_data))
         
         # Save metadata
         metadata_file = os.path.join(saves_dir, f"meta_{save_id}.json")
-        with open(metadata_file, 'w') as f:
-            json.dump(save_data, f, indent=2)
+        _save_cache.pop(metadata_file, None)
+        write_json_atomic(metadata_file, save_data)
         
         print(f"Game saved: {save_data.get('title', 'Unknown')} (ID: {save_id})")
         
@@ -423,7 +652,7 @@ async def save_game(request_data: dict):
             "success": True,
             "message": "Game saved successfully",
             "save_id": save_id,
-            "dalle_requests_used": asset_manager.dalle_request_count
+            "dalle_requests_used": get_asset_manager().dalle_request_count
         }
         
     except Exception as e:
@@ -431,8 +660,8 @@ async def save_game(request_data: dict):
         raise HTTPException(status_code=500, detail=f"Save failed: {str(e)}")
 
 @app.get("/api/game/load/{save_id}")
-async def load_game(save_id: str):
-    """Load saved game with assets"""
+async def load_game(save_id: str, response: Response, if_none_match: Optional[str] = Header(None)):
+    """Load saved game with assets (304 Not Modified if the client's ETag still matches)"""
     try:
         saves_dir = os.path.join(os.getcwd(), "saved_games")
         game_file = os.path.join(saves_dir, f"game_{save_id}.json")
@@ -440,8 +669,10 @@ async def load_game(save_id: str):
         if not os.path.exists(game_file):
             raise HTTPException(status_code=404, detail="Saved game not found")
         
-        with open(game_file, 'r') as f:
-            game_data = json.load(f)
+        game_data, etag = read_save_file(game_file, os.stat(game_file).st_mtime_ns)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": f'"{etag}"'})
+        response.headers["ETag"] = f'"{etag}"'
         
         print(f"Game loaded: {game_data.get('title', 'Unknown')} (ID: {save_id})")
         return game_data
@@ -451,25 +682,36 @@ async def load_game(save_id: str):
         raise HTTPException(status_code=500, detail=f"Load failed: {str(e)}")
 
 @app.get("/api/game/saves")
-async def list_saved_games():
-    """List all saved games"""
+async def list_saved_games(response: Response, limit: Optional[int] = Query(None, ge=1),
+                           if_none_match: Optional[str] = Header(None)):
+    """List saved games (newest first, optionally only the first `limit`)"""
     try:
         saves_dir = os.path.join(os.getcwd(), "saved_games")
         if not os.path.exists(saves_dir):
             return []
         
+        # Sort by file modification time so only the returned metadata files get parsed
+        with os.scandir(saves_dir) as it:
+            entries = [entry for entry in it if entry.name.startswith("meta_") and entry.name.endswith(".json")]
+        entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+        if limit is not None:
+            entries = entries[:limit]
+        
         saved_games = []
-        for filename in os.listdir(saves_dir):
-            if filename.startswith("meta_") and filename.endswith(".json"):
-                try:
-                    with open(os.path.join(saves_dir, filename), 'r') as f:
-                        metadata = json.load(f)
-                        saved_games.append(metadata)
-                except Exception as e:
-                    print(f"Failed to load metadata {filename}: {e}")
-        
-        # Sort by timestamp (newest first)
-        saved_games.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
+        etags = []
+        for entry in entries:
+            try:
+                metadata, etag = read_save_file(entry.path, entry.stat().st_mtime_ns)
+                saved_games.append(metadata)
+                etags.append(etag)
+            except Exception as e:
+                print(f"Failed to load metadata {entry.name}: {e}")
+        
+        # The listing's ETag covers the content of every returned metadata file
+        list_etag = content_etag(','.join(etags).encode())
+        if etag_matches(if_none_match, list_etag):
+            return Response(status_code=304, headers={"ETag": f'"{list_etag}"'})
+        response.headers["ETag"] = f'"{list_etag}"'
         return saved_games
         
     except Exception as e:
@@ -483,6 +725,8 @@ async def delete_saved_game(save_id: str):
         saves_dir = os.path.join(os.getcwd(), "saved_games")
         game_file = os.path.join(saves_dir, f"game_{save_id}.json")
         meta_file = os.path.join(saves_dir, f"meta_{save_id}.json")
+        _save_cache.pop(game_file, None)
+        _save_cache.pop(meta_file, None)
         
         deleted_files = 0
         if os.path.exists(game_file):
@@ -509,41 +753,51 @@ async def websocket_game_stream(websocket: WebSocket):
     global game_engine
     
     if not game_engine:
-        await websocket.send_json({"error": "No game initialized"})
+        await send_ws_json(websocket, {"error": "No game initialized"})
         return
     
     try:
+        loop = asyncio.get_running_loop()
+        frame_time = 1.0 / FPS
+        next_frame = loop.time()
+        frames: List[bytes] = []
+        batch = {"frame_sizes": [], "states": [], "timestamps": []}
+        batch_started = next_frame
         while game_running:
             # Update game
-            game_engine.update(1.0 / FPS)
+            game_engine.update(frame_time)
             
-            # Get frame as base64
+            # Snapshot the frame here, then encode it off the event loop
             surface = game_engine.render()
-            img_array = pygame.surfarray.array3d(surface)
-            img_array = img_array.swapaxes(0, 1)
-            
-            from PIL import Image
-            pil_image = Image.fromarray(img_array)
-            
-            img_buffer = io.BytesIO()
-            pil_image.save(img_buffer, format='PNG')
-            img_base64 = base64.b64encode(img_buffer.getvalue()).decode()
+            pixels, raw_mode = snapshot_frame(surface)
+            jpeg_bytes = await loop.run_in_executor(None, encode_stream_jpeg, pixels, raw_mode, surface.get_size())
             
-            # Send frame and game state
-            await websocket.send_json({
-                "frame": f"data:image/png;base64,{img_base64}",
-                "game_state": game_engine.get_game_state(),
-                "timestamp": asyncio.get_event_loop().time()
-            })
+            # Queue frame and game state, sending a batch once it is full or old enough
+            now = loop.time()
+            if not frames:
+                batch_started = now
+            frames.append(jpeg_bytes)
+            batch["frame_sizes"].append(len(jpeg_bytes))
+            batch["states"].append(game_engine.get_game_state())
+            batch["timestamps"].append(now)
+            if len(frames) >= WS_BATCH_FRAMES or now - batch_started >= WS_BATCH_SECONDS:
+                await send_ws_frames(websocket, batch, frames)
+                frames = []
+                batch = {"frame_sizes": [], "states": [], "timestamps": []}
             
-            # Control frame rate
-            await asyncio.sleep(1.0 / FPS)
+            # Control frame rate against a fixed schedule so encode/send time doesn't add drift
+            next_frame += frame_time
+            delay = next_frame - loop.time()
+            if delay < -frame_time:
+                # More than a frame behind: resync rather than send a burst of catch-up frames
+                next_frame = loop.time()
+            await asyncio.sleep(max(0.0, delay))
             
     except WebSocketDisconnect:
         print("🔌 WebSocket client disconnected")
     except Exception as e:
         print(f"❌ WebSocket error: {str(e)}")
-        await websocket.send_json({"error": str(e)})
+        await send_ws_json(websocket, {"error": str(e)})
 
 if __name__ == "__main__":
     print("Starting AI Game Engine Backend...")
@@ -551,10 +805,18 @@ if __name__ == "__main__":
     print(f"DALL-E requests limited to {MAX_DALLE_REQUESTS_PER_GAME} per game")
     print(f"Asset cache directory: {ASSET_CACHE_DIR}")
     
+    # Auto-reload watches the source tree, so it is opt-in for development (BACKEND_RELOAD=1).
+    # One worker only: the running game lives in this process, so extra workers would not share it.
+    # "auto" picks uvloop, httptools and websockets when they are installed, falling back to asyncio and h11.
+    reload = os.environ.get("BACKEND_RELOAD", "").lower() in ("1", "true", "yes")
     uvicorn.run(
         "main:app",
         host=BACKEND_HOST,
         port=BACKEND_PORT,
-        reload=True,
+        reload=reload,
+        workers=1,
+        loop="auto",
+        http="auto",
+        ws="auto",
         log_level="info"
     )
\ No newline at end of file
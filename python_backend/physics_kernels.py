@@ -0,0 +1,50 @@
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; fall back to NumPy / plain Python
+    njit = None
+
+CAMERA_SMOOTHING = 0.1
+
+def _step_enemies_loop(x, vx, start_x, direction, speed, patrol_range, patrolling):
+    """Simple patrol AI: turn around at the patrol bounds and set horizontal velocity"""
+    for i in range(x.shape[0]):
+        if not patrolling[i]:
+            continue
+        if x[i] >= start_x[i] + patrol_range[i]:
+            direction[i] = -1
+        elif x[i] <= start_x[i]:
+            direction[i] = 1
+        vx[i] = speed[i] * direction[i]
+
+def _step_enemies_numpy(x, vx, start_x, direction, speed, patrol_range, patrolling):
+    """Vectorized equivalent of _step_enemies_loop"""
+    px = x[patrolling]
+    sx = start_x[patrolling]
+    direction[patrolling] = np.where(
+        px >= sx + patrol_range[patrolling], -1,
+        np.where(px <= sx, 1, direction[patrolling])
+    )
+    vx[patrolling] = speed[patrolling] * direction[patrolling]
+
+def _step_camera(cx, cy, px, py, hw, hh):
+    """Move the camera a fraction of the way towards centering on (px, py)"""
+    cx += (px - hw - cx) * CAMERA_SMOOTHING
+    cy += (py - hh - cy) * CAMERA_SMOOTHING
+    return cx, cy
+
+if njit is not None:
+    step_enemies = njit(cache=True, fastmath=True)(_step_enemies_loop)
+    step_camera = njit(cache=True, fastmath=True)(_step_camera)
+else:
+    step_enemies = _step_enemies_numpy
+    step_camera = _step_camera
+
+def warmup():
+    """Compile the kernels ahead of the first frame (no-op without Numba)"""
+    if njit is None:
+        return
+    x = np.zeros(1, dtype=np.float32)
+    step_enemies(x, x.copy(), x.copy(), x.copy(), x.copy(), x.copy(), np.zeros(1, dtype=bool))
+    step_camera(0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
@@ -0,0 +1,89 @@
+from typing import Any, List, Optional, Tuple
+
+# Axis-aligned bounding box as (x, y, width, height)
+AABB = Tuple[float, float, float, float]
+
+class Quadtree:
+    """Region quadtree for broad-phase collision queries.
+
+    Nodes split into four children once they hold more than `capacity` items.
+    Items that straddle a split line stay in the parent node.
+    """
+
+    def __init__(self, bounds: AABB, capacity: int = 4, max_depth: int = 6, depth: int = 0):
+        self.bounds = bounds
+        self.capacity = capacity
+        self.max_depth = max_depth
+        self.depth = depth
+        self.items: List[Tuple[Any, AABB]] = []
+        self.children: Optional[List['Quadtree']] = None
+
+    def insert(self, obj: Any, rect: AABB):
+        """Insert an object with its AABB"""
+        if self.children is not None:
+            child = self._child_for(rect)
+            if child is not None:
+                child.insert(obj, rect)
+                return
+
+        self.items.append((obj, rect))
+
+        if self.children is None and len(self.items) > self.capacity and self.depth < self.max_depth:
+            self._split()
+
+    def query(self, rect: AABB) -> List[Any]:
+        """Get all objects whose AABB overlaps the given AABB (touching edges do not count)"""
+        found: List[Any] = []
+        self._query(rect, found)
+        return found
+
+    def _query(self, rect: AABB, found: List[Any]):
+        x0, y0 = rect[0], rect[1]
+        x1, y1 = x0 + rect[2], y0 + rect[3]
+
+        for obj, (ox, oy, ow, oh) in self.items:
+            if ox < x1 and x0 < ox + ow and oy < y1 and y0 < oy + oh:
+                found.append(obj)
+
+        if self.children is not None:
+            for child in self.children:
+                bx, by, bw, bh = child.bounds
+                if bx < x1 and x0 < bx + bw and by < y1 and y0 < by + bh:
+                    child._query(rect, found)
+
+    def _split(self):
+        """Create four children and push down the items that fit entirely inside one"""
+        x, y, w, h = self.bounds
+        half_w, half_h = w / 2, h / 2
+        self.children = [
+            Quadtree((x + dx, y + dy, half_w, half_h), self.capacity, self.max_depth, self.depth + 1)
+            for dy in (0, half_h)
+            for dx in (0, half_w)
+        ]
+
+        items = self.items
+        self.items = []
+        for obj, rect in items:
+            self.insert(obj, rect)
+
+    def _child_for(self, rect: AABB) -> Optional['Quadtree']:
+        """Get the child that fully contains the AABB, or None if it straddles a split line"""
+        x, y, w, h = self.bounds
+        mid_x, mid_y = x + w / 2, y + h / 2
+        rx, ry, rw, rh = rect
+
+        if rx >= x and rx + rw <= mid_x:
+            col = 0
+        elif rx >= mid_x and rx + rw <= x + w:
+            col = 1
+        else:
+            return None
+
+        if ry >= y and ry + rh <= mid_y:
+            row = 0
+        elif ry >= mid_y and ry + rh <= y + h:
+            row = 1
+        else:
+            return None
+
+        return self.children[row * 2 + col]
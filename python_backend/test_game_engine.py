@@ -0,0 +1,22 @@
+import asyncio
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pytest
+from game_engine import PygameGameEngine
+
+def test_enemy_moves_speed_times_dt_per_tick():
+    """An enemy is stepped once per update, not twice"""
+    engine = PygameGameEngine()
+    asyncio.run(engine.initialize_game({
+        'gameType': 'platformer',
+        'entities': [{'name': 'enemy1', 'type': 'enemy', 'x': 300, 'y': 300}],
+    }, {}))
+    enemy = engine.enemies[0]
+    start_x = enemy.x
+
+    engine.update(1.0 / 60)
+
+    assert enemy.x - start_x == pytest.approx(enemy.speed * enemy.direction / 60, abs=1e-3)
+    assert enemy.x - start_x == pytest.approx(50 / 60, abs=1e-3)